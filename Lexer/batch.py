@@ -0,0 +1,284 @@
+import json
+import mmap
+import os
+import sys
+
+from .lexer import Lexer, BACKENDS, BACKEND_REGEX
+from .limits import LexerLimits, LIMIT_MAX_SECONDS
+from .tokens import *
+
+SOURCE_EXTENSION = '.mono'
+
+# Environment variable naming the default cache directory
+CACHE_DIR_VARIABLE = 'MONO_LEXER_CACHE_DIR'
+DEFAULT_CACHE_MAX_MB = 256
+CACHE_WRITE_BATCH = 256 # new cache entries stored per transaction
+
+# Exit codes
+EXIT_OK = 0
+EXIT_LEXICAL_ERRORS = 1
+EXIT_FAILURE = 2
+
+
+def find_sources(paths):
+    """
+    Expands files and directories into the .mono files to lex, in a deterministic order.
+    Directories are walked recursively and their files sorted; explicit files keep their place.
+    """
+    sources = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in files if name.endswith(SOURCE_EXTENSION))
+            found.sort()
+        else:
+            found = [path]
+
+        for source in found:
+            if source not in seen:
+                seen.add(source)
+                sources.append(source)
+    return sources
+
+
+def token_record(token):
+    """
+    Returns the JSON-ready form of a token, with 1-based line and column.
+    """
+    ln, col = token.line_index.line_col(token.start)
+    return {"type": token.type, "value": token.value, "line": ln + 1, "col": col + 1}
+
+
+def error_record(error):
+    """
+    Returns the JSON-ready form of an error, with 1-based line and column.
+    """
+    ln, col = error.line_index.line_col(error.start)
+    return {"error": error.error_name, "details": error.details, "line": ln + 1, "col": col + 1}
+
+
+def lex_file(path, backend=BACKEND_REGEX, limits=None, cache=None, with_tokens=True):
+    """
+    Lexes one file. Runs in a worker process, so the result is returned already serialized.
+    A run stopped early by the limits is recorded with the limit under "truncated".
+
+    The file is memory-mapped, so the regex backend scans ASCII files without reading them into a str.
+    With a DiskTokenCache, a file whose content was lexed before is served from the cache.
+
+    Returns:
+        tuple: (path, token count, error count, NDJSON line, cache update). The counts are None if the file
+        could not be read. The cache update is None without a cache, (key, None) on a hit, and (key, entry)
+        for a new entry that the parent process stores.
+    """
+    try:
+        with open(path, 'rb') as source:
+            # Empty files cannot be mapped
+            if os.fstat(source.fileno()).st_size == 0:
+                return serialize_file(path, b'', backend, limits, with_tokens, cache)
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return serialize_file(path, data, backend, limits, with_tokens, cache)
+    except (OSError, UnicodeDecodeError) as exc:
+        return path, None, None, json.dumps({"path": path, "failure": str(exc)}), None
+
+
+def serialize_file(path, data, backend, limits, with_tokens, cache=None):
+    """
+    Lexes the contents of one file and serializes the result while the contents are still mapped.
+    The tokens and errors are serialized apart from the path, which is how they are cached.
+    """
+    if cache is not None:
+        key = cache.key(data, limits)
+        entry = cache.get(key, with_tokens)
+        if entry is not None:
+            token_count, error_count, truncated, tokens, errors = entry
+            return path, token_count, error_count, record_line(path, truncated, tokens, errors), (key, None)
+
+    lexer = Lexer(path, data, backend=backend, limits=limits)
+    tokens, errors = lexer.scan_tokens()
+    errors = errors or []
+    tokens_json = json.dumps([token_record(token) for token in tokens]) if with_tokens else None
+    errors_json = json.dumps([error_record(error) for error in errors])
+
+    update = None
+    # Where a deadline stopped the scan depends on the machine, so such a result is not kept
+    if cache is not None and lexer.truncated != LIMIT_MAX_SECONDS:
+        entry = cache.entry(len(tokens), len(errors), lexer.truncated, tokens_json, errors_json)
+        if entry is not None:
+            update = key, entry
+    return path, len(tokens), len(errors), record_line(path, lexer.truncated, tokens_json, errors_json), update
+
+
+def record_line(path, truncated, tokens, errors):
+    """
+    Joins the NDJSON record of a file from its serialized tokens and errors, as json.dumps would write the record.
+    """
+    line = '{"path": ' + json.dumps(path)
+    if truncated:
+        line += ', "truncated": ' + json.dumps(truncated)
+    if tokens is not None:
+        line += ', "tokens": ' + tokens
+    return line + ', "errors": ' + errors + '}'
+
+
+def lex_file_summary(path, backend=BACKEND_REGEX, limits=None, cache=None):
+    return lex_file(path, backend, limits, cache, with_tokens=False)
+
+
+def run_batch(paths, out, workers=None, chunksize=None, output_format='ndjson', backend=BACKEND_REGEX, limits=None,
+              cache=None):
+    """
+    Lexes every .mono file under the paths in a process pool and writes the results in input order.
+    With a DiskTokenCache, unchanged files are served from the cache, which is trimmed to its size limit afterwards.
+
+    Returns:
+        int: The exit code: 0 when clean, 1 when any file has lexical errors, 2 when a file could not be read.
+    """
+    sources = find_sources(paths)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(sources) // (workers * 4))
+
+    task = lex_file if output_format == 'ndjson' else lex_file_summary
+    backends = [backend] * len(sources)
+    limits = [limits] * len(sources)
+    caches = [cache] * len(sources)
+
+    if workers == 1 or len(sources) <= 1:
+        results = map(task, sources, backends, limits, caches)
+        code = write_results(update_cache(results, cache), out, output_format)
+    else:
+        # Imported here: the pool takes longer to import than the lexer, and workers and one-shot runs do without it
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Executor.map yields in submission order, which keeps the output deterministic
+            results = pool.map(task, sources, backends, limits, caches, chunksize=chunksize)
+            code = write_results(update_cache(results, cache), out, output_format)
+
+    if cache is not None:
+        cache.evictions += cache.evict()
+    return code
+
+
+def update_cache(results, cache):
+    """
+    Passes the per-file results on without their cache updates, storing the new cache entries in batches,
+    counting hits and misses, and marking the entries that were hit as used once all results are through.
+    """
+    hits = []
+    entries = []
+    for path, token_count, error_count, line, update in results:
+        if update is not None:
+            key, entry = update
+            if entry is None:
+                hits.append(key)
+            else:
+                entries.append(update)
+                if len(entries) >= CACHE_WRITE_BATCH:
+                    cache.put_many(entries)
+                    entries.clear()
+        if cache is not None and token_count is not None and (update is None or update[1] is not None):
+            cache.misses += 1
+        yield path, token_count, error_count, line
+
+    if cache is not None:
+        cache.put_many(entries)
+        cache.hits += len(hits)
+        cache.touch(hits)
+
+
+def write_results(results, out, output_format):
+    """
+    Writes the per-file results as NDJSON lines or as a summary report.
+
+    Returns:
+        int: The exit code.
+    """
+    files = tokens = errors = failures = 0
+    files_with_errors = 0
+
+    for path, token_count, error_count, line in results:
+        files += 1
+        if token_count is None:
+            failures += 1
+        else:
+            tokens += token_count
+            errors += error_count
+            files_with_errors += bool(error_count)
+
+        if output_format == 'ndjson':
+            out.write(line + '\n')
+        elif token_count is None:
+            out.write(f"{path}: could not be read ({json.loads(line)['failure']})\n")
+        elif error_count:
+            out.write(f"{path}: {token_count} tokens, {error_count} errors\n")
+            for error in json.loads(line)["errors"]:
+                out.write(f"  {error['line']}:{error['col']}: {error['error']}: {error['details']}\n")
+
+    if output_format == 'summary':
+        out.write(f"{files} files, {tokens} tokens, {errors} errors in {files_with_errors} files")
+        out.write(f", {failures} unreadable\n" if failures else "\n")
+
+    if failures:
+        return EXIT_FAILURE
+    return EXIT_LEXICAL_ERRORS if errors else EXIT_OK
+
+
+def write_cache_stats(stats, out):
+    lookups = stats["hits"] + stats["misses"]
+    rate = stats["hits"] / lookups if lookups else 0
+    if stats["entries"] is None:
+        size = "unavailable"
+    else:
+        size = f"{stats['entries']} entries, {stats['bytes'] / 2**20:.1f} of {stats['max_bytes'] / 2**20:.0f} MB"
+    out.write(f"cache: {stats['hits']} hits, {stats['misses']} misses ({rate:.0%} hit rate), {size}, "
+              f"{stats['evictions']} evicted\n")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m Lexer', description='Lex .mono files and report tokens and errors.')
+    parser.add_argument('paths', nargs='+', help='.mono files or directories to search recursively')
+    parser.add_argument('-f', '--format', choices=('ndjson', 'summary'), default='ndjson',
+                        help='one JSON record per file, or a summary report (default: ndjson)')
+    parser.add_argument('-o', '--output', help='write to this file instead of stdout')
+    parser.add_argument('-j', '--workers', type=int, help='worker processes (default: number of CPUs)')
+    parser.add_argument('--chunksize', type=int, help='files handed to a worker at a time')
+    parser.add_argument('--backend', choices=BACKENDS, default=BACKEND_REGEX, help='scanning backend (default: regex)')
+    parser.add_argument('--max-errors', type=int, help='stop lexing a file after this many errors')
+    parser.add_argument('--max-seconds', type=float, help='stop lexing a file after this many seconds')
+    parser.add_argument('--max-input-size', type=int, help='do not lex files longer than this many characters')
+    parser.add_argument('--cache-dir', default=os.environ.get(CACHE_DIR_VARIABLE),
+                        help=f'keep results in this directory and reuse them for unchanged files (default: ${CACHE_DIR_VARIABLE})')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_MB,
+                        help=f'size limit of the cache (default: {DEFAULT_CACHE_MAX_MB})')
+    parser.add_argument('--cache-stats', action='store_true', help='print cache hits, misses and size to stderr')
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.chunksize is not None and args.chunksize < 1:
+        parser.error('--chunksize must be at least 1')
+    if args.cache_stats and not args.cache_dir:
+        parser.error('--cache-stats needs --cache-dir')
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        limits = LexerLimits(args.max_errors, args.max_seconds, max_input_size=args.max_input_size)
+        cache = None
+        if args.cache_dir:
+            from Utils.disk_cache import DiskTokenCache
+            from .fingerprint import lexer_fingerprint
+
+            cache = DiskTokenCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024), lexer_fingerprint())
+        code = run_batch(args.paths, out, args.workers, args.chunksize, args.format, args.backend, limits, cache)
+        if args.cache_stats:
+            write_cache_stats(cache.stats(), sys.stderr)
+        return code
+    finally:
+        if args.output:
+            out.close()
@@ -129,46 +129,84 @@ escape_chars_dict = {
     "\\": "\\"
 }
 
+# ---- CHARACTER CLASSES ----
+
+# One code per character class. A class string holds the code of every character of a text
+CLASS_LETTER = 'L'
+CLASS_DIGIT = 'D'
+CLASS_SPACE = 'S'
+CLASS_OPERATOR = 'O'
+CLASS_UNDERSCORE = 'U'
+CLASS_HASH = 'H' # starts a comment, and is an invalid symbol inside identifiers and numbers
+CLASS_DOT = 'P'
+CLASS_QUOTE = 'Q'
+CLASS_SPECIAL = 'Y' # the other special symbols
+CLASS_INVALID = 'I'
+CLASS_OTHER = 'X' # any other character
+
+SPECIAL_CLASSES = CLASS_SPECIAL + CLASS_DOT + CLASS_QUOTE + CLASS_UNDERSCORE
+INVALID_CLASSES = CLASS_INVALID + CLASS_HASH
+IDENTIFIER_CLASSES = CLASS_LETTER + CLASS_DIGIT + CLASS_UNDERSCORE + INVALID_CLASSES
+NUMBER_CLASSES = IDENTIFIER_CLASSES + CLASS_SPACE + CLASS_DOT
+
+def build_char_classes():
+    """
+    Builds the class of every ASCII character from the character tables above.
+    """
+    classes = {chr(code): CLASS_OTHER for code in range(128)}
+    for table, char_class in ((special_symbol_dict, CLASS_SPECIAL), (invalid_symbols_dict, CLASS_INVALID),
+                              (operators_dict, CLASS_OPERATOR), (whitespaces_dict, CLASS_SPACE),
+                              (digits_dict, CLASS_DIGIT), (alpha_dict, CLASS_LETTER)):
+        for char in table:
+            if len(char) == 1:
+                classes[char] = char_class
+
+    classes['_'] = CLASS_UNDERSCORE
+    classes['#'] = CLASS_HASH
+    classes['.'] = CLASS_DOT
+    classes['"'] = CLASS_QUOTE
+    return classes
+
+# Class of every ASCII character; characters outside ASCII are CLASS_OTHER
+CHAR_CLASSES = build_char_classes()
+
+# Translation tables that turn a whole text into its class string at once
+CLASS_TABLE = str.maketrans(CHAR_CLASSES)
+CLASS_TABLE_BYTES = bytes(ord(CHAR_CLASSES[chr(code)]) if code < 128 else ord(CLASS_OTHER) for code in range(256))
+
+def classify(text):
+    """
+    Classifies every character of a str or bytes-like text in one pass.
+
+    Returns:
+        str: The class string, as long as the text. Characters outside ASCII keep their own character
+        in the class string of a str, which matches no class code, so they classify as CLASS_OTHER.
+    """
+    if isinstance(text, str):
+        return text.translate(CLASS_TABLE)
+    return bytes(text).translate(CLASS_TABLE_BYTES).decode('ascii')
+
+def char_class(char):
+    return CHAR_CLASSES.get(char, CLASS_OTHER)
+
 def is_letter(char):
-    func = alpha_dict.get(char, not_found_char)
-    return func()
+    return CHAR_CLASSES.get(char) == CLASS_LETTER
 
 def is_digit(char):
-    func = digits_dict.get(char, not_found_char)
-    return func()
+    return CHAR_CLASSES.get(char) == CLASS_DIGIT
 
+# The empty string (past the end of the input) has always been whitespace and an invalid symbol
 def is_space(char):
-    func = whitespaces_dict.get(char, not_found_char)
-    return func()
+    return CHAR_CLASSES.get(char) == CLASS_SPACE or char == ''
 
 def is_operator(char):
-    func = operators_dict.get(char, not_found_char)
-    return func()
+    return CHAR_CLASSES.get(char) == CLASS_OPERATOR
 
 def is_special_symbol(char):
-    func = special_symbol_dict.get(char, not_found_char)
-    return func()
+    return char_class(char) in SPECIAL_CLASSES
 
 def is_invalid_symbol(char):
-    func = invalid_symbols_dict.get(char, not_found_char)
-    return func()
+    return char_class(char) in INVALID_CLASSES or char == ''
 
 def is_in_char_set(char):
-    func1 = alpha_dict.get(char, not_found_char)
-    func2 = digits_dict.get(char, not_found_char)
-    func3 = whitespaces_dict.get(char, not_found_char)
-    func4 = operators_dict.get(char, not_found_char)
-    func5 = special_symbol_dict.get(char, not_found_char)
-    
-    if func1():
-        return func1()
-    elif func2():
-        return func2()
-    elif func3():
-        return func3()
-    elif func4():
-        return func4()
-    elif func5():
-        return func5()
-    else:
-        return False
\ No newline at end of file
+    return char_class(char) in CLASS_LETTER + CLASS_DIGIT + CLASS_SPACE + CLASS_OPERATOR + SPECIAL_CLASSES or char == ''
@@ -0,0 +1,125 @@
+import re
+
+from errors.lexer_errors import *
+from .tokens import *
+from Utils.snake_case import SNAKE_CASE
+
+DIGITS = re.compile(r'[0-9]+')
+
+# String content up to the closing quote or the end of the input, with escapes kept whole
+STRING_BODY = re.compile(r'[^"\\]*(?:\\[\s\S]?[^"\\]*)*')
+ESCAPE = re.compile(r'\\([\s\S]?)')
+
+
+def classify_identifier(lexeme):
+    """
+    Resolves the token type of a complete identifier run.
+
+    Returns:
+        str: The token type, or None if the lexeme is not a valid identifier.
+    """
+    tokentype = WORD_TYPES.get(lexeme, TT_IDENTIFIER)
+
+    if lexeme.isupper() and lexeme.startswith('_'):
+        tokentype = TT_PRIV_CONST_IDENTIFIER
+    elif lexeme.isupper():
+        tokentype = TT_CONST_IDENTIFIER
+    elif lexeme.startswith('_'):
+        tokentype = TT_PRIV_IDENTIFIER
+
+    if tokentype == TT_IDENTIFIER and not SNAKE_CASE.fullmatch(lexeme):
+        return None
+    return tokentype
+
+
+# Marks a name that is not in a symbol table yet; invalid names are stored as None
+UNSEEN = object()
+
+
+class SymbolTable:
+    """
+    The identifier names of one input. Each distinct name is classified (word tables, case and
+    snake_case check) once, and every token of the name shares one (token type, name) record,
+    so a name repeated all over a file keeps a single string alive.
+
+    Lexemes may be str or, when an ASCII buffer is scanned, bytes, which are then decoded once per name.
+    """
+    def __init__(self):
+        self.records = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def identifier(self, lexeme):
+        """
+        Returns:
+            tuple: (token type, name), or None if the name is not a valid identifier.
+        """
+        record = self.records.get(lexeme, UNSEEN)
+        if record is UNSEEN:
+            name = lexeme if type(lexeme) is str else lexeme.decode('ascii')
+            tokentype = classify_identifier(name)
+            record = self.records[lexeme] = (tokentype, name) if tokentype is not None else None
+        return record
+
+
+def classify_number(run):
+    """
+    Classifies a complete number run the same way Lexer.generate_number_token does.
+
+    Returns:
+        tuple: (token type, value, None) for a valid number, or (None, details, error class).
+    """
+    if DIGITS.fullmatch(run):
+        return TT_INTEGER, int(run), None
+
+    num_str = ''
+    dot_count = 0
+    is_valid = True
+    id_identifier = False
+    last = len(run) - 1
+
+    for i, char in enumerate(run):
+        next_char = run[i + 1] if i < last else ''
+
+        if num_str and char == '_' and next_char == '_' or is_valid == False:
+            is_valid = False
+            num_str += char
+        elif char.isalpha() or char in '$#@{}':
+            is_valid = False
+            num_str += char
+        elif not num_str and char.isdigit() and next_char.isalpha():
+            id_identifier = True
+            num_str += char
+        elif char == '.':
+            if dot_count == 1:
+                dot_count += 1
+            dot_count += 1
+            num_str += '.'
+        elif char != '_':
+            num_str += char
+
+    if dot_count == 0 and is_valid == True and id_identifier == False:
+        return TT_INTEGER, int(num_str), None
+    elif dot_count == 2 and is_valid == True:
+        return None, num_str, LexicalError
+    elif id_identifier:
+        return None, num_str, IllegalIdentifierError
+    elif is_valid == False:
+        return None, num_str, IllegalNumberError
+    elif num_str == '.':
+        return TT_DOT, num_str, None
+    try:
+        return TT_FLOAT, float(num_str), None
+    except ValueError:
+        return None, 'Invalid Decimal', InvalidDecimalError
+
+
+def unescape_string(body):
+    """
+    Applies the string escape rules: \\" and \\\\ keep the escaped character, any other escape collapses to a backslash.
+    Only bodies that contain a backslash are rewritten.
+    """
+    if '\\' not in body:
+        return body
+    return ESCAPE.sub(lambda m: m.group(1) if m.group(1) in ('"', '\\') else '\\', body)
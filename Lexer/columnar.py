@@ -0,0 +1,197 @@
+from array import array
+from collections.abc import Sequence
+
+from .line_index import LineIndex
+from .limits import ScanBudget
+from .regex_scanner import scan_matches, eof_offset
+from .source import text_slice
+from .tokens import *
+
+# Column names of the token table, as shown by the Streamlit app
+LEXEME_COLUMN = 'Lexeme'
+TOKEN_COLUMN = 'Token'
+START_COLUMN = 'Start'
+END_COLUMN = 'End'
+LINE_COLUMN = 'Line'
+
+# Values that follow from the token type alone, so they are not stored per row
+IMPLIED_VALUES = {TYPE_CODES[TT_NEWLINE]: FIXED_TOKENS['\n'][1], TYPE_CODES[TT_EOF]: TT_EOF}
+
+
+class TokenColumns(Sequence):
+    """
+    Tokens of one input stored column-wise: a type-code array and start/end offset arrays,
+    with lexemes sliced from the source on demand. Only values that differ from their lexeme
+    and do not follow from the type (numbers, strings and docstrings) are kept as objects,
+    so a token takes about 17 bytes plus its value, against some 70 for a Token.
+
+    Indexing and iterating yield Tokens, built on access, like a list of tokens.
+    Converts to a pandas DataFrame or a pyarrow Table without building a row per token.
+    The text may be an ASCII buffer, in which case lexemes are decoded as they are sliced.
+    """
+    def __init__(self, text, line_index=None):
+        self.text = text
+        self.line_index = line_index if line_index is not None else LineIndex('<columns>', text)
+        self.types = array('B') # code of each token's type, an index into TOKEN_TYPES
+        self.starts = array('q')
+        self.ends = array('q')
+        self.values = {} # row -> value, where it is not the lexeme
+
+    @classmethod
+    def from_tokens(cls, tokens, text, line_index=None):
+        """
+        Builds the columns of a list of tokens scanned from the text.
+        """
+        columns = cls(text, line_index)
+        for token in tokens:
+            if isinstance(token, Token):
+                columns.append(token.type, token.value, token.start, token.end)
+        return columns
+
+    def append(self, tokentype, value, start, end):
+        row = len(self.types)
+        code = TYPE_CODES[tokentype]
+        self.types.append(code)
+        self.starts.append(start)
+        self.ends.append(end)
+        if code in IMPLIED_VALUES:
+            if value != IMPLIED_VALUES[code]:
+                self.values[row] = value
+        elif type(value) is not str or len(value) != end - start or value != text_slice(self.text, start, end):
+            self.values[row] = value
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self.token(i) for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError('token index out of range')
+        return self.token(row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.token(row)
+
+    def type(self, row):
+        return TOKEN_TYPES[self.types[row]]
+
+    def lexeme(self, row):
+        return text_slice(self.text, self.starts[row], self.ends[row])
+
+    def value(self, row):
+        if row in self.values:
+            return self.values[row]
+        return IMPLIED_VALUES.get(self.types[row]) or self.lexeme(row)
+
+    def token(self, row):
+        """
+        Builds the Token of one row.
+        """
+        return Token(self.type(row), self.value(row), self.starts[row], self.ends[row], self.line_index)
+
+    def lexemes(self):
+        text = self.text
+        if not isinstance(text, str):
+            return [text_slice(text, start, end) for start, end in zip(self.starts, self.ends)]
+        return [text[start:end] for start, end in zip(self.starts, self.ends)]
+
+    def token_values(self):
+        """
+        Returns the value of every token, as Token.value would hold it.
+        """
+        values = self.lexemes()
+        types = self.types.tobytes()
+        for code, value in IMPLIED_VALUES.items():
+            row = types.find(code)
+            while row >= 0:
+                values[row] = value
+                row = types.find(code, row + 1)
+        for row, value in self.values.items():
+            values[row] = value
+        return values
+
+    def type_counts(self):
+        """
+        Returns the number of tokens of each type that occurs.
+        """
+        counts = [0] * len(TOKEN_TYPES)
+        for code in self.types:
+            counts[code] += 1
+        return {TOKEN_TYPES[code]: count for code, count in enumerate(counts) if count}
+
+    def to_numpy(self):
+        """
+        Returns the type codes and offsets as NumPy arrays sharing the columns' memory.
+        """
+        import numpy as np
+
+        return (np.frombuffer(self.types, dtype=np.uint8),
+                np.frombuffer(self.starts, dtype=np.int64),
+                np.frombuffer(self.ends, dtype=np.int64))
+
+    def to_dataframe(self, offsets=False, lines=False):
+        """
+        Returns the token table as a pandas DataFrame: the token values and a categorical column of token types,
+        with offsets=True the start and end offsets as well, and with lines=True the 1-based line of each token.
+        """
+        import numpy as np
+        import pandas as pd
+
+        codes, starts, ends = self.to_numpy()
+        data = {}
+        if lines:
+            # One vectorized binary search over the line starts for all tokens
+            line_index = self.line_index
+            line_starts = np.asarray(line_index.line_starts, dtype=np.int64)
+            data[LINE_COLUMN] = line_index.first_line + np.searchsorted(line_starts, starts - line_index.base, side='right')
+        data[LEXEME_COLUMN] = pd.Series(self.token_values(), dtype=object)
+        data[TOKEN_COLUMN] = pd.Categorical.from_codes(codes, categories=TOKEN_TYPES)
+        if offsets:
+            data[START_COLUMN] = starts
+            data[END_COLUMN] = ends
+        return pd.DataFrame(data)
+
+    def to_arrow(self):
+        """
+        Returns the tokens as a pyarrow Table with a dictionary-encoded type column,
+        the start and end offsets and the lexemes as sliced from the source.
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        codes, starts, ends = self.to_numpy()
+        # Signed dictionary indices are the most widely supported; every code fits in an int8
+        return pa.table({
+            'type': pa.DictionaryArray.from_arrays(pa.array(codes.view(np.int8)), pa.array(TOKEN_TYPES)),
+            'start': pa.array(starts),
+            'end': pa.array(ends),
+            'lexeme': pa.array(self.lexemes(), type=pa.string()),
+        })
+
+
+def scan_columns(fn, text, line_index=None, limits=None):
+    """
+    Scans the input text with the regex backend straight into columns, without a Token per lexeme.
+    Stops at the same offsets as scan_regex when limits are given, and takes an ASCII buffer as scan_regex does.
+
+    Returns:
+        TokenColumns: The tokens.
+        list: A list of errors, or None.
+    """
+    if line_index is None:
+        line_index = LineIndex(fn, text)
+
+    columns = TokenColumns(text, line_index)
+    errors = []
+    append = columns.append
+    for start, end, (tokentype, value) in scan_matches(text, line_index, ScanBudget(limits, len(text)), errors):
+        append(tokentype, value, start, end)
+
+    # End of File
+    eof = eof_offset(len(text), errors)
+    append(TT_EOF, TT_EOF, eof, eof + 1)
+    return columns, errors if errors else None
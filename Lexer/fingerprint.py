@@ -0,0 +1,24 @@
+import hashlib
+import os
+from functools import lru_cache
+
+# Packages whose source decides the lexer output
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIRS = ('Lexer', 'errors', 'Utils')
+
+
+@lru_cache(maxsize=None)
+def lexer_fingerprint():
+    """
+    Returns a hash of the lexer, error and utility sources (including the token tables in Lexer/tokens.py).
+    Cached lexer results are only valid for the fingerprint they were produced with.
+    """
+    digest = hashlib.sha256()
+    for directory in SOURCE_DIRS:
+        path = os.path.join(ROOT, directory)
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.py'):
+                digest.update(f'{directory}/{name}\0'.encode())
+                with open(os.path.join(path, name), 'rb') as source:
+                    digest.update(source.read())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,201 @@
+from .regex_scanner import MASTER_PATTERN, match_result, eof_token
+from .tokens import *
+
+# Items compared at a time when looking for the common start and end of two texts
+DIFF_BLOCK = 1 << 12
+
+
+def lexeme_span(item):
+    """
+    Returns the (start, end) offsets of a token or an error.
+    """
+    return item.start, item.end
+
+
+def count_ending_before(items, offset):
+    """
+    Returns how many of the ordered tokens or errors end before the offset.
+    """
+    lo, hi = 0, len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if lexeme_span(items[mid])[1] < offset:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def count_starting_before(items, offset):
+    """
+    Returns how many of the ordered tokens or errors start before the offset.
+    """
+    lo, hi = 0, len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if lexeme_span(items[mid])[0] < offset:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def common_prefix(old, new, limit=None):
+    """
+    Returns how many leading items two sequences (texts or arrays) share, up to limit.
+    Whole blocks are compared as slices, and the block that differs is bisected, so the comparisons run in C.
+    """
+    limit = min(len(old), len(new)) if limit is None else limit
+    idx = 0
+    while idx + DIFF_BLOCK <= limit and old[idx:idx + DIFF_BLOCK] == new[idx:idx + DIFF_BLOCK]:
+        idx += DIFF_BLOCK
+    hi = min(idx + DIFF_BLOCK, limit)
+    while idx < hi:
+        mid = (idx + hi + 1) // 2
+        if old[idx:mid] == new[idx:mid]:
+            idx = mid
+        else:
+            hi = mid - 1
+    return idx
+
+
+def common_suffix(old, new, limit=None):
+    """
+    Returns how many trailing items two sequences share, up to limit, as common_prefix does.
+    """
+    limit = min(len(old), len(new)) if limit is None else limit
+    old_end, new_end = len(old), len(new)
+    idx = 0
+    while idx + DIFF_BLOCK <= limit and old[old_end - idx - DIFF_BLOCK:old_end - idx] == new[new_end - idx - DIFF_BLOCK:new_end - idx]:
+        idx += DIFF_BLOCK
+    hi = min(idx + DIFF_BLOCK, limit)
+    while idx < hi:
+        mid = (idx + hi + 1) // 2
+        if old[old_end - mid:old_end - idx] == new[new_end - mid:new_end - idx]:
+            idx = mid
+        else:
+            hi = mid - 1
+    return idx
+
+
+def diff_edit(old_text, new_text):
+    """
+    Describes the change between two texts as a single edit.
+
+    Returns:
+        tuple: (offset, removed length, inserted text)
+    """
+    prefix = common_prefix(old_text, new_text)
+    suffix = common_suffix(old_text, new_text, min(len(old_text), len(new_text)) - prefix)
+    return prefix, len(old_text) - prefix - suffix, new_text[prefix:len(new_text) - suffix]
+
+
+def find_gap(tokens):
+    """
+    Returns the index of the first token that counts its offsets from the end of the text: the tokens
+    of an incrementally updated result do from the last edit on.
+    """
+    lo, hi = 0, len(tokens)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if tokens[mid].from_end:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def move_gap(tokens, gap, split, length):
+    """
+    Makes the tokens before `split` count their offsets from the start of the text and the rest from its end,
+    given that this held at `gap` before. Only the tokens between the two are touched, so edits near the last
+    one are cheap.
+    """
+    for token in tokens[gap:split]:
+        token.count_from_start(length)
+    for token in tokens[split:gap]:
+        token.count_from_end(length)
+
+
+def relex(old_text, tokens, errors, offset, removed, inserted, budget=None):
+    """
+    Updates a scan_tokens result for an edit that replaces `removed` characters at `offset` with `inserted`.
+
+    Scanning restarts at the end of the last lexeme that ends before the edit (no match before that
+    point can see the edited text) and stops as soon as a match starts where an old lexeme started
+    after the edit: from a match boundary the scanner only depends on the text ahead of it, so the
+    rest of the old result still holds. A docstring opened or closed by the edit simply keeps the
+    rescan going until that happens.
+
+    Untouched tokens are reused as they are. The tokens after the edit count their offsets back from the
+    end of the text, so they need no shifting, and the rescanned tokens replace the old ones in place:
+    apart from copying the text, an edit costs the rescan plus the tokens between it and the previous edit.
+
+    The token list and the tokens' line index are updated to the new text in place, so the previous
+    result must not be reused. With a ScanBudget for the new text, the rescan checks its deadline and the
+    total error count as scan_tokens would, and gives up once either limit is reached.
+
+    Returns:
+        tuple: (the edited text, a list of tokens, a list of errors or None), or None if a limit was reached.
+    """
+    errors = errors or []
+    eof = tokens.pop()
+    line_index = eof.line_index
+    text = old_text[:offset] + inserted + old_text[offset + removed:]
+    delta = len(inserted) - removed
+
+    # Lexemes that end before the edit are unaffected
+    token_prefix = count_ending_before(tokens, offset)
+    error_prefix = count_ending_before(errors, offset)
+    restart = max([lexeme_span(item)[1] for item in (tokens[token_prefix - 1:token_prefix] + errors[error_prefix - 1:error_prefix])] or [0])
+
+    # Old lexemes after the edit are candidates to resynchronize with; counted from the end, they already
+    # have their offsets in the new text
+    token_suffix = count_starting_before(tokens, offset + removed)
+    error_suffix = count_starting_before(errors, offset + removed)
+    move_gap(tokens, find_gap(tokens), token_suffix, len(old_text))
+    line_index.edit(text, offset, removed, inserted)
+    edit_end = offset + len(inserted)
+
+    new_tokens = []
+    new_errors = []
+    synced = False
+
+    checkpoint = budget.checkpoint if budget is not None else float('inf')
+    max_errors = budget.max_errors - error_prefix if budget is not None else float('inf')
+
+    for match in MASTER_PATTERN.finditer(text, restart):
+        start = match.start()
+        if start >= checkpoint or len(new_errors) >= max_errors:
+            if budget.check(start, error_prefix + len(new_errors)) is not None:
+                return None
+            checkpoint = budget.checkpoint
+        if start >= edit_end:
+            while token_suffix < len(tokens) and tokens[token_suffix].start < start:
+                token_suffix += 1
+            while error_suffix < len(errors) and errors[error_suffix].start + delta < start:
+                error_suffix += 1
+            if (token_suffix < len(tokens) and tokens[token_suffix].start == start) or \
+               (error_suffix < len(errors) and errors[error_suffix].start + delta == start):
+                synced = True
+                break
+
+        result = match_result(match, line_index)
+        if result is not None:
+            (new_tokens if isinstance(result, Token) else new_errors).append(result)
+
+    if synced:
+        # Errors are rare, and their messages can mention line numbers, so they are rebuilt from the new text
+        for error in errors[error_suffix:]:
+            new_errors.append(match_result(MASTER_PATTERN.match(text, error.start + delta), line_index))
+    else:
+        token_suffix = len(tokens)
+
+    tokens[token_prefix:token_suffix] = new_tokens
+    errors[error_prefix:] = new_errors
+    if budget is not None and len(errors) >= budget.max_errors:
+        return None
+
+    # End of File
+    tokens.append(eof_token(len(text), errors, line_index))
+    return text, tokens, errors if errors else None
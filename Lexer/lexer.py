@@ -1,39 +1,109 @@
+import time
+
 from .char_validators import *
 from errors.base_error import *
 from errors.lexer_errors import *
-from .position import Position
+from .line_index import LineIndex
 from .tokens import *
-from Utils.snake_case import SNAKE_CASE
+from .classifiers import SymbolTable, classify_number, unescape_string, STRING_BODY
+from .regex_scanner import scan_regex, truncated_eof
+from .columnar import TokenColumns, scan_columns
+from .source import SOURCE_ENCODING, source_text
+from .prepass import Boundaries, has_numpy
+from .limits import ScanBudget, LIMIT_MAX_INPUT_SIZE
+from .incremental import relex
+from .stats import LexerStats, StageStats
+
+# Scanning backends selectable on the Lexer
+BACKEND_CHAR = 'char'
+BACKEND_REGEX = 'regex'
+BACKEND_PREPASS = 'prepass'
+BACKENDS = (BACKEND_CHAR, BACKEND_REGEX, BACKEND_PREPASS)
+
+def available_backends():
+    """
+    Returns the backends whose dependencies are installed: the prepass backend needs NumPy.
+    """
+    return tuple(backend for backend in BACKENDS if backend != BACKEND_PREPASS or has_numpy())
+
+def operator_lexeme(text, idx):
+    """
+    Returns the longest lexeme of the operator tables at the offset, or '' if none starts there.
+    """
+    lexeme = text[idx:idx + OPERATOR_MAX_LEN]
+    while lexeme and lexeme not in OPERATOR_TYPES and lexeme not in INVALID_RELATIONAL:
+        lexeme = lexeme[:-1]
+    return lexeme
 
 class Lexer:
     """
     The Lexer class tokenizes the input text character by character and converts it into tokens.
     It also reports errors and warnings.
+
+    The 'regex' backend produces the same tokens and errors from a single compiled master pattern.
+    The 'prepass' backend scans over boundaries computed in bulk with NumPy (see Lexer.prepass): whitespace,
+    identifiers and numbers are taken a whole run at a time by a loop of its own, scan_runs.
+    With profile=True, scan_tokens records per-method and per-kind counters in self.stats.
+    With limits (a LexerLimits), scan_tokens stops early once a limit is reached and returns the partial
+    result, ending with a TruncatedInputError; self.truncated then names the limit.
+
+    The text may also be bytes, a memoryview or an mmap of a file. The regex backend scans a pure-ASCII
+    buffer in place and only decodes the lexemes it turns into values; anything else is decoded once.
     """
-    def __init__(self, fn, text):
+    def __init__(self, fn, text, backend=BACKEND_CHAR, profile=False, limits=None, encoding=SOURCE_ENCODING):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown lexer backend '{backend}', expected one of {', '.join(BACKENDS)}")
+        text = source_text(text, encoding, keep_ascii=backend == BACKEND_REGEX)
+
         self.fn = fn # filename
         self.text = text # input text
-        self.pos = Position(-1, 0, -1, fn, text) # position pointer
+        self.backend = backend # scanning backend
+        self.line_index = LineIndex(fn, text) # line-start offsets, resolved on demand
+        self.idx = -1 # position pointer
         self.current_char = None # current character
+        self.classes = None # class string of the text, while the char backend scans
+        self.boundaries = None # run boundaries of the text, while the prepass backend scans
+        self.symbols = SymbolTable() # identifier names seen by the char and prepass backends
+        self.stats = None # profiling counters, only when profiling
+        self.limits = limits # resource limits of scan_tokens, or None
+        self.truncated = None # the limit that stopped the last scan early, or None
         self.advance()
 
+        if profile:
+            self.stats = LexerStats(backend)
+            self.stats.instrument(self)
+
     def advance(self):
         """
         Advances the position pointer to the next character in the input text.
         """
-        self.pos.advance(self.current_char)
-        self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
+        self.idx += 1
+        self.current_char = self.text[self.idx] if self.idx < len(self.text) else None
+
+    def jump(self, idx):
+        """
+        Moves the position pointer straight to an offset.
+        """
+        self.idx = idx
+        self.current_char = self.text[idx] if idx < len(self.text) else None
 
     def peek_next_char(self):
         """
         Peeks at the next character in the input text without advancing the position pointer.
         """
         try:
-            char = self.text[self.pos.idx + 1] if self.pos.idx < len(self.text) else None
+            char = self.text[self.idx + 1] if self.idx < len(self.text) else None
         except IndexError:
             char = ''
         return char if char is not None else ''
 
+    def next_class(self):
+        """
+        Returns the character class of the next character, or None at the end of the input.
+        """
+        idx = self.idx + 1
+        return self.classes[idx] if idx < len(self.classes) else None
+
 # ---- FIRST SCANNING METHOD ----
 
     def scan_tokens(self):
@@ -44,249 +114,339 @@ class Lexer:
             list: A list of tokens.
             list: A list of errors.
         """
+        if self.stats is not None:
+            return self.profile_scan()
+
+        if self.backend == BACKEND_REGEX:
+            tokens, errors = scan_regex(self.fn, self.text, self.line_index, self.limits)
+            self.truncated = errors[-1].reason if errors and isinstance(errors[-1], TruncatedInputError) else None
+            return tokens, errors
+
         tokens = []
         errors = []
+        self.truncated = None
+
+        # Without limits, the budget stops at the end of the input and never checks anything else
+        budget = ScanBudget(self.limits, len(self.text))
+        if budget.input_too_large():
+            self.truncated = LIMIT_MAX_INPUT_SIZE
+            return truncated_eof(0, self.truncated, budget, tokens, errors, self.line_index)
+        stop = budget.stop
+        max_errors = budget.max_errors
+
+        # The class of every character, looked up by offset instead of calling a validator per check
+        if self.backend == BACKEND_PREPASS:
+            self.boundaries = Boundaries(self.text)
+            self.line_index.line_starts = self.boundaries.line_starts
+            self.classes = self.boundaries.classes
+            return self.scan_runs(budget, tokens, errors)
+        self.boundaries = None
+        self.classes = classes = classify(self.text)
 
         # Scans the input text character by character
-        while self.current_char != None:
-            char = self.current_char
+        while self.idx < stop:
+            if self.idx >= budget.checkpoint or len(errors) >= max_errors:
+                self.truncated = budget.check(self.idx, len(errors))
+                if self.truncated:
+                    return truncated_eof(self.idx, self.truncated, budget, tokens, errors, self.line_index)
+
+            char_class = classes[self.idx]
             
             # Skips whitespaces
-            if is_space(char):
+            if char_class == CLASS_SPACE:
                 self.advance()
 
             # Scans keywords, reserved words, noise words, boolean values, data types, and identifiers
-            elif is_letter(char) or char == '_':
+            elif char_class == CLASS_LETTER or char_class == CLASS_UNDERSCORE:
                 result = self.generate_identifier_token()
                 (tokens if isinstance(result, Token) else errors).append(result)
 
             # Scans arithmetic operators: +, -, *, /, ~, ^, %, invalid relational symbols such as !, &, |, &&, and ||, and assignment operator and relational lexemes
-            elif is_operator(char):
+            elif char_class == CLASS_OPERATOR:
                 result = self.generate_operator_token()
                 (tokens if isinstance(result, Token) else errors).append(result)
                 
             # Scans single-line comments
-            elif char == '#':
+            elif char_class == CLASS_HASH:
                 result = self.generate_comment_token()
                 (tokens if isinstance(result, Token) else errors).append(result)
            
             # Scan for numbers only if the dot is followed by a digit
-            elif is_digit(char) or (char == '.' and is_digit(self.peek_next_char())):
+            elif char_class == CLASS_DIGIT or (char_class == CLASS_DOT and self.next_class() == CLASS_DIGIT):
                 result = self.generate_number_token()
                 (tokens if isinstance(result, Token) else errors).append(result)
                 
             # Scans for string literals and multi-line docstrings
-            elif char == '"':
+            elif char_class == CLASS_QUOTE:
                 result = self.generate_string_or_docstring_token()
                 (tokens if isinstance(result, Token) else errors).append(result)
                 
             # Scans for special symbols such as ., ,, [, ], (, ), and newline character
-            elif is_special_symbol(char):
-                tokens.append(self.generate_special_symbol_token())
-                self.advance()
+            elif char_class == CLASS_SPECIAL or char_class == CLASS_DOT:
+                result = self.generate_special_symbol_token()
+                if result is None:
+                    errors.append(self.generate_illegal_char_error())
+                else:
+                    tokens.append(result)
+                    self.advance()
 
             # Returns an error when an invalid character is scanned
             else:
-                pos_start = self.pos.copy()
-                self.advance()
-                errors.append(IllegalCharError(pos_start, self.pos.copy(),
-                                               f"Illegal character '{char}' at line {pos_start.ln + 1}, column {pos_start.col + 1}"))
+                errors.append(self.generate_illegal_char_error())
+
+        # Stopped at the character limit before the end of the input
+        if self.idx < len(self.text):
+            self.truncated = budget.check(self.idx, len(errors))
+            return truncated_eof(self.idx, self.truncated, budget, tokens, errors, self.line_index)
         
         # End of File
-        tokens.append(Token('TT_EOF', TT_EOF, pos_start=self.pos.copy()))
+        tokens.append(Token('TT_EOF', TT_EOF, self.idx, line_index=self.line_index))
+        return tokens, errors if errors else None
+
+    def scan_runs(self, budget, tokens, errors):
+        """
+        The scanning loop of the prepass backend, dispatching on character classes as scan_tokens does.
+        Whitespace, identifiers, numbers, operators and special symbols are handled inline, the runs taken
+        straight from the precomputed boundaries and the position kept in a local; comments, strings and
+        illegal characters go through the generate_* methods.
+
+        Returns:
+            list: A list of tokens.
+            list: A list of errors.
+        """
+        text = self.text
+        classes = self.classes
+        word_end = self.boundaries.word_end
+        number_end = self.boundaries.number_end
+        line_index = self.line_index
+        identifier = self.symbols.identifier
+        stop = budget.stop
+        checkpoint = budget.checkpoint
+        max_errors = budget.max_errors
+        idx = self.idx
+
+        while idx < stop:
+            if idx >= checkpoint or len(errors) >= max_errors:
+                self.truncated = budget.check(idx, len(errors))
+                if self.truncated:
+                    self.jump(idx)
+                    return truncated_eof(idx, self.truncated, budget, tokens, errors, line_index)
+                checkpoint = budget.checkpoint
+
+            char_class = classes[idx]
+
+            # Skips the whole whitespace run, but no further than where a character limit stops the scan
+            if char_class == CLASS_SPACE:
+                idx = word_end[idx]
+                if idx > stop:
+                    idx = stop
+
+            # Identifiers and words, classified once per distinct name as in generate_identifier_token
+            elif char_class == CLASS_LETTER or char_class == CLASS_UNDERSCORE:
+                end = word_end[idx]
+                lexeme = text[idx:end]
+                record = identifier(lexeme)
+                if record is None:
+                    errors.append(IllegalIdentifierError(
+                        idx, end, line_index, f"Invalid identifier '{lexeme}' does not follow snake_case naming convention."))
+                else:
+                    tokens.append(Token(record[0], record[1], idx, end, line_index))
+                idx = end
+
+            # Numbers, the whole run classified as in generate_number_token
+            elif char_class == CLASS_DIGIT or (char_class == CLASS_DOT and idx + 1 < len(classes) and classes[idx + 1] == CLASS_DIGIT):
+                end = number_end[idx]
+                tokentype, value, error = classify_number(text[idx:end])
+                if error is None:
+                    tokens.append(Token(tokentype, value, idx, end, line_index))
+                else:
+                    errors.append(error(idx, end, line_index, f'{value}'))
+                idx = end
+
+            # Special symbols, as in generate_special_symbol_token
+            elif (char_class == CLASS_SPECIAL or char_class == CLASS_DOT) and text[idx] in SPECIAL_TYPES:
+                tokentype, value = FIXED_TOKENS[text[idx]]
+                tokens.append(Token(tokentype, value, idx, idx + 1, line_index))
+                idx += 1
+
+            # Operators, the longest lexeme found in the operator tables as in generate_operator_token
+            elif char_class == CLASS_OPERATOR and (lexeme := operator_lexeme(text, idx)):
+                end = idx + len(lexeme)
+                if lexeme in OPERATOR_TYPES:
+                    tokentype, value = FIXED_TOKENS[lexeme]
+                    tokens.append(Token(tokentype, value, idx, end, line_index))
+                else:
+                    errors.append(InvalidRelationalSymbol(
+                        idx, end, line_index, f'"{lexeme}", Consider using "{INVALID_RELATIONAL[lexeme]}" instead.'))
+                idx = end
+
+            else:
+                self.jump(idx)
+                if char_class == CLASS_HASH:
+                    result = self.generate_comment_token()
+                elif char_class == CLASS_QUOTE:
+                    result = self.generate_string_or_docstring_token()
+                else:
+                    result = self.generate_illegal_char_error()
+                (tokens if isinstance(result, Token) else errors).append(result)
+                idx = self.idx
+
+        self.jump(idx)
+
+        # Stopped at the character limit before the end of the input
+        if idx < len(text):
+            self.truncated = budget.check(idx, len(errors))
+            return truncated_eof(idx, self.truncated, budget, tokens, errors, line_index)
+
+        # End of File
+        tokens.append(Token('TT_EOF', TT_EOF, idx, line_index=line_index))
         return tokens, errors if errors else None
 
+    def scan_columns(self):
+        """
+        Scans the input text into columns (TokenColumns) instead of a list of tokens.
+        The regex backend fills the columns directly; the char backend converts its tokens.
+
+        Returns:
+            TokenColumns: The tokens.
+            list: A list of errors.
+        """
+        if self.backend == BACKEND_REGEX and self.stats is None:
+            columns, errors = scan_columns(self.fn, self.text, self.line_index, self.limits)
+            self.truncated = errors[-1].reason if errors and isinstance(errors[-1], TruncatedInputError) else None
+            return columns, errors
+
+        tokens, errors = self.scan_tokens()
+        return TokenColumns.from_tokens(tokens, self.text, self.line_index), errors
+
+    def profile_scan(self):
+        """
+        Runs scan_tokens with profiling counters and records the results in self.stats.
+        """
+        stats = self.stats
+        self.stats = None
+        start = time.perf_counter()
+        try:
+            tokens, errors = self.scan_tokens()
+        finally:
+            self.stats = stats
+        seconds = time.perf_counter() - start
+
+        # The regex backend is one stage; the prepass loop takes most lexemes inline, so it gets one besides its methods
+        stage_name = {BACKEND_REGEX: 'scan_regex', BACKEND_PREPASS: 'scan_runs'}.get(self.backend)
+        if stage_name is not None:
+            stage = stats.stages.setdefault(stage_name, StageStats())
+            stage.calls += 1
+            stage.seconds += seconds
+            stage.chars += len(self.text)
+
+        stats.finish(tokens, errors, len(self.text), seconds)
+        return tokens, errors
+
+    def relex(self, tokens, errors, offset, removed, inserted):
+        """
+        Applies an edit to the input text and updates the previous result of scan_tokens,
+        re-scanning only around the edit. A truncated result cannot be updated.
+        With limits, the re-scan stops once one is reached, and the whole edited text is scanned
+        again as scan_tokens would, so the result is truncated at the same offset.
+
+        Args:
+            tokens (list): The tokens returned by scan_tokens for the current text.
+            errors (list): The errors returned by scan_tokens for the current text.
+            offset (int): Where the edit starts.
+            removed (int): How many characters the edit removes.
+            inserted (str): The text the edit inserts.
+
+        Returns:
+            list: A list of tokens.
+            list: A list of errors.
+        """
+        # Edits are applied to a str, so a buffer is decoded first
+        text = source_text(self.text, keep_ascii=False)
+        budget = ScanBudget(self.limits, len(text) - removed + len(inserted))
+        result = None
+        if not budget.input_too_large() and budget.stop == budget.length:
+            result = relex(text, tokens, errors, offset, removed, inserted, budget)
+
+        self.truncated = None
+        self.idx = -1
+        self.current_char = None
+        if result is None:
+            # A limit applies: the full scan stops where it would have without the previous result
+            self.text = text[:offset] + inserted + text[offset + removed:]
+            self.line_index = LineIndex(self.fn, self.text)
+            self.advance()
+            return self.scan_tokens()
+
+        self.text, tokens, errors = result
+        self.line_index = tokens[-1].line_index
+        self.advance()
+        return tokens, errors
+
 # ---- SECOND SCANNING METHOD ----
+    def generate_illegal_char_error(self):
+        """
+        Handles a character that does not start any lexeme.
+
+        Returns:
+            IllegalCharError: The error for the current character.
+        """
+        char = self.current_char
+        pos_start = self.idx
+        ln, col = self.line_index.line_col(pos_start)
+        self.advance()
+        return IllegalCharError(pos_start, self.idx, self.line_index,
+                                f"Illegal character '{char}' at line {ln + 1}, column {col + 1}")
+
     def generate_operator_token(self):
         """
         Handles arithmetic operators, invalid relational symbols, and assignment operators.
+        Takes the longest lexeme found in the operator tables.
         
         Returns: 
             Token: The token containing the operator value.
         """
-        tokentype = ''
-        lexeme = ''
-        details = ''
-        isTok = False
-        isErr = False
-        pos_start = self.pos.copy()
-
-        if self.current_char == '+':
-            tokentype = TT_PLUS
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '=':
-                tokentype = TT_PLUS_ASSIGN
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-            elif self.current_char == '+':
-                tokentype = TT_INCREMENT
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-        elif self.current_char == '-':
-            tokentype = TT_MINUS
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '=':
-                tokentype = TT_MINUS_ASSIGN
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-            elif self.current_char == '-':
-                tokentype = TT_DECREMENT
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-        elif self.current_char == '*':
-            tokentype = TT_MULTIPLY
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '=':
-                    tokentype = TT_MULTIPLY_ASSIGN
-                    lexeme += self.current_char
-                    isTok = True
-                    self.advance()
-            
-        elif self.current_char == '/':
-            tokentype = TT_DIVIDE
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '/':
-                tokentype = TT_FLOOR_DIVIDE
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-                if self.current_char == '=':
-                    tokentype = TT_FLOOR_DIVIDE_ASSIGN
-                    lexeme += self.current_char
-                    isTok = True
-                    self.advance()
-            elif self.current_char == '=':
-                tokentype = TT_DIVIDE_ASSIGN
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-                    
-        elif self.current_char == '^':
-            tokentype = TT_EXPONENT
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '=':
-                tokentype = TT_EXPONENT_ASSIGN
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-        elif self.current_char == '%':
-            tokentype = TT_MODULO
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '=':
-                tokentype = TT_MODULO_ASSIGN
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-        elif self.current_char == '=':
-            tokentype = TT_ASSIGNMENT
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '=':
-                tokentype = TT_EQUAL
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-        elif self.current_char == '>':
-            tokentype = TT_GREATER
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '=':
-                tokentype = TT_GREATER_EQUAL
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-        elif self.current_char == '<':
-            tokentype = TT_LESS
-            lexeme += self.current_char
-            isTok = True
-            self.advance()
-            if self.current_char == '=':
-                tokentype = TT_LESS_EQUAL
-                lexeme += self.current_char
-                isTok = True
-                self.advance()
-        elif self.current_char == '!':
-            lexeme += self.current_char
-            details = f'"{lexeme}", Consider using "not" instead.'
-            isErr = True
-            self.advance()
-            if self.current_char == '=':
-                tokentype = TT_NOT_EQUAL
-                lexeme += self.current_char
-                isTok = True
-                isErr = False
-                self.advance()
-        elif self.current_char == '&':
-            lexeme += self.current_char
-            details = f'"{lexeme}", Consider using "and" instead.'
-            isErr = True
-            self.advance()
-            if self.current_char == '&':
-                lexeme += self.current_char
-                details = f'"{lexeme}", Consider using "and" instead.'
-                isErr = True
-                self.advance()
-        elif self.current_char == '|':
-            lexeme += self.current_char
-            details = f'"{lexeme}", Consider using "or" instead.'
-            isErr = True
-            self.advance()
-            if self.current_char == '|':
-                lexeme += self.current_char
-                details = f'"{lexeme}", Consider using "or" instead.'
-                isErr = True
-                self.advance()
-
-        if isTok:
-            return Token(tokentype, lexeme, pos_start, self.pos.copy())
-        elif isErr:
-            return InvalidRelationalSymbol(pos_start, self.pos.copy(), details)
+        pos_start = self.idx
+        lexeme = operator_lexeme(self.text, pos_start)
+        if not lexeme:
+            # Operator characters without an operator of their own, such as ~
+            return self.generate_illegal_char_error()
+
+        self.jump(pos_start + len(lexeme))
+
+        if lexeme in OPERATOR_TYPES:
+            tokentype, value = FIXED_TOKENS[lexeme]
+            return Token(tokentype, value, pos_start, self.idx, self.line_index)
+        return InvalidRelationalSymbol(pos_start, self.idx, self.line_index,
+                                       f'"{lexeme}", Consider using "{INVALID_RELATIONAL[lexeme]}" instead.')
         
     def generate_comment_token(self):
         """
         Handles single-line comments, extracting the value and returning a token.
+        The comment is taken as one slice up to the end of the line.
 
         Returns:
             Token: The token containing the comment value.
         """
-        pos_start = self.pos.copy()
-        comment_str = '#'
-        self.advance()
+        pos_start = self.idx
+        end = self.text.find('\n', pos_start)
+        if end < 0:
+            end = len(self.text)
 
-        while self.current_char != '\n' and self.current_char is not None:
-            comment_str += self.current_char
-            self.advance()
-
-        return Token(TT_COMMENT, comment_str, pos_start, self.pos.copy())
+        self.jump(end)
+        return Token(TT_COMMENT, self.text[pos_start:end], pos_start, end, self.line_index)
    
     def generate_string_or_docstring_token(self):
         """
         Handles string literals and multi-line docstrings, extracting the value and returning a token.
+        The string body is matched up to its closing quote in one step; escapes are only
+        processed when the body contains a backslash.
         
         Returns:
             Token: The token containing the string value.
         """
-        string_value = ''
         quotes = self.current_char
-        pos_start = self.pos.copy()
+        pos_start = self.idx
 
         # Check if it's the start of a multi-line docstring
         if quotes == '"' and self.peek_next_char() == '"':
@@ -295,63 +455,43 @@ class Lexer:
             return self.make_multiline_string(pos_start)  
 
         if quotes == '"':  
-            self.advance() 
-
-            if self.current_char == '"': 
-                self.advance()  
-                return Token(TT_STRING, string_value, pos_start=pos_start, pos_end=self.pos.copy()) 
-
-            # Handle string content and escape sequences
-            while self.current_char != '"' and self.current_char is not None:
-                if self.current_char == '\\':  
-                    self.advance()  
-                    if self.current_char in ['"', '\\']:  
-                        string_value += self.current_char
-                    else:
-                        string_value += '\\'  
-                else:
-                    string_value += self.current_char
-                self.advance()
+            body = STRING_BODY.match(self.text, pos_start + 1)
+            end = body.end()
 
-            if self.current_char == '"':  
-                self.advance()  
-                return Token(TT_STRING, string_value, pos_start=pos_start, pos_end=self.pos.copy())
+            # The body only stops early at the closing quote
+            if end < len(self.text):
+                self.jump(end + 1)
+                return Token(TT_STRING, unescape_string(body.group()), pos_start, self.idx, self.line_index)
 
-            return Error(pos_start, self.pos.copy(), 'Unterminated string literal', 'String is not properly closed')
+            # A dangling backslash at the end of the input steps one past it
+            string_value = body.group()
+            if (len(string_value) - len(string_value.rstrip('\\'))) % 2:
+                end += 1
+            self.jump(end)
+            return Error(pos_start, self.idx, self.line_index, 'Unterminated string literal', 'String is not properly closed')
 
         return None
 
 
-
     def make_multiline_string(self, pos_start):
         """
         Handles multi-line docstrings, extracting the value and returning a token.
+        Jumps straight to the closing triple quotes.
         
         Returns:
             Token: The token containing the multi-line string value.
         """
-        string_value = '"""'  
-        self.advance()  
+        # The opening quotes are followed by one character that is not part of the value
+        self.advance()
+        close = self.text.find('"""', self.idx)
 
-        # Capture the content between the triple quotes
-        while self.current_char != None:
-            if self.current_char == '"':  
-                self.advance()
-                if self.current_char == '"':  
-                    self.advance()
-                    if self.current_char == '"':  
-                        self.advance()
-                        string_value += '"""' 
-                        return Token(TT_DOCSTRING, string_value, pos_start=pos_start, pos_end=self.pos.copy()) 
-                    else:
-                        string_value += '"'  
-                else:
-                    string_value += '"'  
-            else:
-                string_value += self.current_char
-                self.advance()
+        if close >= 0:
+            string_value = '"""' + self.text[self.idx:close].replace('""', '"') + '"""'
+            self.jump(close + 3)
+            return Token(TT_DOCSTRING, string_value, pos_start, self.idx, self.line_index)
 
-        return Error(pos_start, self.pos.copy(), 'Unterminated multi-line string literal', 'Multi-line string is not properly closed')
+        self.jump(max(self.idx, len(self.text)))
+        return Error(pos_start, self.idx, self.line_index, 'Unterminated multi-line string literal', 'Multi-line string is not properly closed')
 
 
     def generate_number_token(self):
@@ -361,33 +501,35 @@ class Lexer:
         Returns:
             Token: The token containing the number value.
         """
-        pos_start = self.pos.copy()
+        pos_start = self.idx
         num_str = ''
         dot_count = 0
         is_valid = True
         id_identifier = False
             
-        while self.current_char != None and (is_letter(self.current_char) or is_digit(self.current_char) or is_space(self.current_char) or is_invalid_symbol(self.current_char) or self.current_char == '_' or self.current_char == '.'):
-            temptchar = self.peek_next_char()
+        classes = self.classes
+        while self.current_char != None and classes[self.idx] in NUMBER_CLASSES:
+            char_class = classes[self.idx]
+            next_class = self.next_class()
 
-            if is_space(self.current_char):
+            if char_class == CLASS_SPACE:
                 break
             
             # Handle cases where the number starts with an underscore
-            elif num_str and self.current_char == '_' and temptchar == '_' or   is_valid == False: 
+            elif num_str and char_class == CLASS_UNDERSCORE and next_class == CLASS_UNDERSCORE or   is_valid == False: 
                 is_valid = False
                 num_str += self.current_char
                 
-            elif is_letter(self.current_char) or is_invalid_symbol(self.current_char):
+            elif char_class == CLASS_LETTER or char_class in INVALID_CLASSES:
                 is_valid = False
                 num_str += self.current_char
             
-            elif (not num_str and is_digit(self.current_char)) and is_letter(temptchar) and not is_space(temptchar):
+            elif (not num_str and char_class == CLASS_DIGIT) and next_class == CLASS_LETTER:
                 id_identifier = True
                 num_str += self.current_char
             
             # Handle the dot in the number
-            elif self.current_char == '.':
+            elif char_class == CLASS_DOT:
                 if dot_count == 1:
                     dot_count += 1
                 dot_count += 1
@@ -399,20 +541,20 @@ class Lexer:
 
         # Error handling for invalid numbers
         if dot_count == 0 and   is_valid == True and id_identifier == False:
-            return Token(TT_INTEGER, int(num_str), pos_start, self.pos.copy())
+            return Token(TT_INTEGER, int(num_str), pos_start, self.idx, self.line_index)
         elif dot_count == 2 and is_valid == True:
-            return LexicalError(pos_start, self.pos.copy(), f'{num_str}')
+            return LexicalError(pos_start, self.idx, self.line_index, f'{num_str}')
         elif id_identifier:
-            return IllegalIdentifierError(pos_start, self.pos.copy(), f'{num_str}')
+            return IllegalIdentifierError(pos_start, self.idx, self.line_index, f'{num_str}')
         elif    is_valid == False:
-            return IllegalNumberError(pos_start, self.pos.copy(), f'{num_str}')
+            return IllegalNumberError(pos_start, self.idx, self.line_index, f'{num_str}')
         elif num_str == '.':
-            return Token(TT_DOT, num_str, pos_start, self.pos.copy())
+            return Token(TT_DOT, num_str, pos_start, self.idx, self.line_index)
         else:
             try:
-                return Token(TT_FLOAT, float(num_str), pos_start, self.pos.copy())
+                return Token(TT_FLOAT, float(num_str), pos_start, self.idx, self.line_index)
             except ValueError:
-                return InvalidDecimalError(pos_start, self.pos.copy(), "Invalid Decimal")
+                return InvalidDecimalError(pos_start, self.idx, self.line_index, "Invalid Decimal")
 
 
     def generate_special_symbol_token(self):
@@ -420,519 +562,44 @@ class Lexer:
         Handles special symbols such as ., ,, [, ], (, ), and newline character.
         
         Returns:
-            Token: The token containing the special symbol value.
-        """
-        if is_special_symbol(self.current_char):
-            char = self.current_char
-            if char == '.':
-                return Token(TT_DOT, char, self.pos.copy())
-            elif char == ',':
-                return Token(TT_COMMA, char, self.pos.copy())
-            elif char == '?':
-                return Token(TT_QUESTION, char, self.pos.copy())
-            elif char == ':':
-                return Token(TT_COLON, char, self.pos.copy())
-            elif char == ';':
-                return Token(TT_SEMICOLON, char, self.pos.copy())
-            elif char == '[':
-                return Token(TT_LSQUARE, char, self.pos.copy())
-            elif char == ']':
-                return Token(TT_RSQUARE, char, self.pos.copy())
-            elif char == '(':
-                return Token(TT_LPAREN, char, self.pos.copy())
-            elif char == ')':
-                return Token(TT_RPAREN, char, self.pos.copy())
-            elif char == '{':
-                return Token(TT_LCURLY, char, self.pos.copy())
-            elif char == '}':
-                return Token(TT_RCURLY, char, self.pos.copy())
-            elif char == '\n':
-                return Token(TT_NEWLINE, '\\n', self.pos.copy())
+            Token: The token containing the special symbol value, or None if the symbol has no token type.
+        """
+        char = self.current_char
+        if char not in SPECIAL_TYPES:
+            return None
+        tokentype, value = FIXED_TOKENS[char]
+        return Token(tokentype, value, self.idx, line_index=self.line_index)
     
     
     def generate_identifier_token(self):
         """
         Handles keywords, reserved words, noise words, boolean values, data types, and identifiers.
+        Scans the whole identifier run first, then looks the lexeme up in the word tables.
         
         Returns:
             Token: The token containing the identifier value.
         """
-        lexeme = ''
-        tokentype = TT_IDENTIFIER
-        pos_start = self.pos.copy()
+        pos_start = self.idx
 
-        while self.current_char != None and (is_letter(self.current_char) or is_digit(self.current_char) or is_space(self.current_char) or is_invalid_symbol(self.current_char) or self.current_char == '_'):
-            # Whitespaces
-            if is_space(self.current_char):
-                break
+        # The run ends at the first character that cannot be part of an identifier
+        classes = self.classes
+        idx = pos_start
+        end = len(classes)
+        while idx < end and classes[idx] in IDENTIFIER_CLASSES:
+            idx += 1
+        self.jump(idx)
 
-            # and, any, as
-            elif self.current_char == 'a' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                # and = 'AND'
-                if self.current_char == 'n':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'd':
-                        lexeme += self.current_char
-                        tokentype = TT_AND
-                        self.advance()
-                    # any = 'ANY'
-                    elif self.current_char == 'y':
-                        lexeme += self.current_char
-                        tokentype = TT_KEYWORD
-                        self.advance()
-                        
-                # as = KEYWORD
-                elif self.current_char == 's':
-                    lexeme += self.current_char
-                    tokentype = TT_KEYWORD
-                    self.advance()
-                    
+        # Each distinct name is classified once per lexer, and its tokens share one name string
+        lexeme = self.text[pos_start:self.idx]
+        record = self.symbols.identifier(lexeme)
 
-            # bool, break
-            elif self.current_char == 'b' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                
-                # bool = DATA_TYPE
-                if self.current_char == 'o':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'o':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'l':
-                            lexeme += self.current_char
-                            tokentype = TT_DATA_TYPE
-                            self.advance()
-                
-                # break = KEYWORD
-                elif self.current_char == 'r':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'e':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'a':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 'k':
-                                lexeme += self.current_char
-                                tokentype = TT_KEYWORD
-                                self.advance()
-
-            # catch
-            elif self.current_char == 'c' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                
-                # catch = KEYWORD
-                if self.current_char == 'a':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 't':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'c':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 'h':
-                                lexeme += self.current_char
-                                tokentype = TT_KEYWORD
-                                self.advance()
-                            
-                        
-
-            # dict, do
-            elif self.current_char == 'd' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                # dict = KEYWORD
-                if self.current_char == 'i':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'c':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 't':
-                            lexeme += self.current_char
-                            tokentype = TT_KEYWORD
-                            self.advance()
-                                           
-                # do = NOISE_WORD
-                elif self.current_char == 'o':
-                    lexeme += self.current_char
-                    tokentype = TT_NOISE_WORD
-                    self.advance()
-                                    
-                                    
-            # elif, else, end, ensure
-            elif self.current_char == 'e' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                
-                # elif = KEYWORD
-                if self.current_char == 'l':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'i':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'f':
-                            lexeme += self.current_char
-                            tokentype = TT_KEYWORD
-                            self.advance()
-                            
-                    # else = KEYWORD
-                    elif self.current_char == 's':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'e':
-                            lexeme += self.current_char
-                            tokentype = TT_KEYWORD
-                            self.advance()
-                            
-                # end = NOISE_WORD
-                elif self.current_char == 'n':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'd':
-                        lexeme += self.current_char
-                        tokentype = TT_NOISE_WORD
-                        self.advance()
-                        
-                    # ensure = KEYWORD
-                    elif self.current_char == 's':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'u':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 'r':
-                                lexeme += self.current_char
-                                self.advance()
-                                if self.current_char == 'e':
-                                    lexeme += self.current_char
-                                    tokentype = TT_KEYWORD
-                                    self.advance()
-                                
-
-            # false, float, fn, for                                  
-            elif self.current_char == 'f' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                
-                # false = BOOL
-                if self.current_char == 'a':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'l':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 's':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 'e':
-                                lexeme += self.current_char
-                                tokentype = TT_BOOL
-                                self.advance()
-                
-                # float = DATA_TYPE
-                elif self.current_char == 'l':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'o':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'a':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 't':
-                                lexeme += self.current_char
-                                tokentype = TT_DATA_TYPE
-                                self.advance()
-                
-                # fn = KEYWORD
-                elif self.current_char == 'n':
-                    lexeme += self.current_char
-                    tokentype = TT_KEYWORD
-                    self.advance()
-                                
-                # for = KEYWORD
-                elif self.current_char == 'o':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'r':
-                        lexeme += self.current_char
-                        tokentype = TT_KEYWORD
-                        self.advance()
-                            
-            # if, import, in, input, int
-            elif self.current_char == 'i' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                
-                # if = KEYWORD
-                if self.current_char == 'f':
-                    lexeme += self.current_char
-                    tokentype = TT_KEYWORD
-                    self.advance()
-                    
-                # import = RESERVED_WORD
-                elif self.current_char == 'm':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'p':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'o':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 'r':
-                                lexeme += self.current_char
-                                self.advance()
-                                if self.current_char == 't':
-                                    lexeme += self.current_char
-                                    tokentype = TT_RESERVED_WORD
-                                    self.advance()
-                
-                # in = KEYWORD
-                elif self.current_char == 'n':
-                    lexeme += self.current_char
-                    tokentype = TT_KEYWORD
-                    self.advance()
-        
-                    # input = KEYWORD
-                    if self.current_char == 'p':
-                        lexeme += self.current_char
-                        tokentype = TT_IDENTIFIER
-                        self.advance()
-                        if self.current_char == 'u':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 't':
-                                lexeme += self.current_char
-                                tokentype = TT_KEYWORD
-                                self.advance()
-                                
-                                # input_int = KEYWORD
-                                if self.current_char == '_':
-                                    lexeme += self.current_char
-                                    self.advance()
-                                    if self.current_char == 'i':
-                                        lexeme += self.current_char
-                                        self.advance()
-                                        if self.current_char == 'n':
-                                            lexeme += self.current_char
-                                            self.advance()
-                                            if self.current_char == 't':
-                                                lexeme += self.current_char
-                                                tokentype = TT_KEYWORD
-                                                self.advance()
-                    
-                    # int = DATA_TYPE
-                    elif self.current_char == 't':
-                        lexeme += self.current_char
-                        tokentype = TT_DATA_TYPE
-                        self.advance()
-                        
-                    
-
-            # not, null
-            elif self.current_char == 'n' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-            
-                # not = 'NOT'
-                if self.current_char == 'o':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 't':
-                            lexeme += self.current_char
-                            tokentype = TT_NOT
-                            self.advance()
-                            
-                # null = 'NULL'
-                elif self.current_char == 'u':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'l':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'l':
-                            lexeme += self.current_char
-                            tokentype = TT_RESERVED_WORD
-                            self.advance()
-  
-
-            # or = 'OR'
-            elif self.current_char == 'o' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                if self.current_char == 'r':
-                    lexeme += self.current_char
-                    tokentype = TT_OR
-                    self.advance()
-                    
-            # print = KEYWORD
-            elif self.current_char == 'p' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                if self.current_char == 'r':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'i':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'n':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 't':
-                                lexeme += self.current_char
-                                tokentype = TT_KEYWORD
-                                self.advance()
-            
-            # return = KEYWORD
-            elif self.current_char == 'r' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                if self.current_char == 'e':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 't':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'u':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 'r':
-                                lexeme += self.current_char
-                                self.advance()
-                                if self.current_char == 'n':
-                                    lexeme += self.current_char
-                                    tokentype = TT_KEYWORD
-                                    self.advance()
-                                               
-            # skip, start, str
-            elif self.current_char == 's' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                                  
-                # skip = KEYWORD
-                if self.current_char == 'k':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'i':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'p':
-                            lexeme += self.current_char
-                            tokentype = TT_KEYWORD
-                            self.advance()
-                
-                # start = NOISE_WORD
-                elif self.current_char == 't':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'a':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'r':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 't':
-                                lexeme += self.current_char
-                                tokentype = TT_NOISE_WORD
-                                self.advance()
-                    
-                    # str = DATA_TYPE
-                    elif self.current_char == 'r':
-                        lexeme += self.current_char
-                        tokentype = TT_DATA_TYPE
-                        self.advance()
-
-
-            # throw, true, try
-            elif self.current_char == 't' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                        
-                # throw = KEYWORD
-                if self.current_char == 'h':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'r':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'o':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char == 'w':
-                                lexeme += self.current_char
-                                tokentype = TT_KEYWORD
-                                self.advance()
-                            
-                # true = BOOL
-                elif self.current_char == 'r':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'u':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'e':
-                            lexeme += self.current_char
-                            tokentype = TT_BOOL
-                            self.advance()
-                            
-                    # try = KEYWORD
-                    elif self.current_char == 'y':
-                        lexeme += self.current_char
-                        tokentype = TT_KEYWORD
-                        self.advance()
-                        
-
-            # while = KEYWORD
-            elif self.current_char == 'w' and len(lexeme) == 0:
-                lexeme += self.current_char
-                self.advance()
-                if self.current_char == 'h':
-                    lexeme += self.current_char
-                    self.advance()
-                    if self.current_char == 'i':
-                        lexeme += self.current_char
-                        self.advance()
-                        if self.current_char == 'l':
-                            lexeme += self.current_char
-                            self.advance()
-                            if self.current_char =='e':
-                                lexeme += self.current_char
-                                tokentype = TT_KEYWORD
-                                self.advance()
-
-            # Other identifiers
-            else:
-                lexeme += self.current_char
-                tokentype = TT_IDENTIFIER
-                self.advance()
-        
-        # Determine the type of identifier after building the lexeme
-        if lexeme.isupper() and lexeme.startswith('_'):
-            tokentype = TT_PRIV_CONST_IDENTIFIER
-        elif lexeme.isupper():
-            tokentype = TT_CONST_IDENTIFIER
-        elif lexeme.startswith('_'):
-            tokentype = TT_PRIV_IDENTIFIER
-            
-        
         # Validate snake_case convention
-        if tokentype == TT_IDENTIFIER and not SNAKE_CASE.fullmatch(lexeme):
+        if record is None:
             return IllegalIdentifierError(
                 pos_start,
-                self.pos.copy(),
+                self.idx,
+                self.line_index,
                 f"Invalid identifier '{lexeme}' does not follow snake_case naming convention."
             )
 
-        return Token(tokentype, lexeme, pos_start, self.pos.copy())
-
+        return Token(record[0], record[1], pos_start, self.idx, self.line_index)
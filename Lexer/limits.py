@@ -0,0 +1,86 @@
+import time
+
+# How many characters are scanned between two checks of the wall-clock deadline
+DEADLINE_CHECK_INTERVAL = 1 << 12
+
+# Reasons a scan stops early
+LIMIT_MAX_ERRORS = 'max_errors'
+LIMIT_MAX_SECONDS = 'max_seconds'
+LIMIT_MAX_CHARS = 'max_chars'
+LIMIT_MAX_INPUT_SIZE = 'max_input_size'
+
+
+class LexerLimits:
+    """
+    Resource limits of one scan. A limit of None is not enforced.
+
+    max_errors: stop once this many errors have been found.
+    max_seconds: stop once the scan has run this long (wall-clock).
+    max_chars: stop at the first lexeme starting at or past this offset.
+    max_input_size: do not scan inputs longer than this at all.
+    """
+    def __init__(self, max_errors=None, max_seconds=None, max_chars=None, max_input_size=None):
+        self.max_errors = max_errors
+        self.max_seconds = max_seconds
+        self.max_chars = max_chars
+        self.max_input_size = max_input_size
+
+    def __repr__(self):
+        return (f'LexerLimits(max_errors={self.max_errors}, max_seconds={self.max_seconds}, '
+                f'max_chars={self.max_chars}, max_input_size={self.max_input_size})')
+
+
+class ScanBudget:
+    """
+    What is left of the limits while scanning one input.
+    The scanning loops compare offsets and the error count against stop, checkpoint and max_errors
+    (which never trigger without limits) and only call check once one of them is reached.
+    """
+    def __init__(self, limits, length):
+        self.limits = limits
+        self.length = length
+        self.stop = length
+        self.max_errors = float('inf')
+        self.checkpoint = float('inf')
+        self.deadline = None
+
+        if limits is None:
+            return
+        if limits.max_chars is not None:
+            self.stop = min(length, limits.max_chars)
+        if limits.max_errors is not None:
+            self.max_errors = limits.max_errors
+        if limits.max_seconds is not None:
+            self.deadline = time.perf_counter() + limits.max_seconds
+            self.checkpoint = DEADLINE_CHECK_INTERVAL
+
+    def input_too_large(self):
+        limits = self.limits
+        return limits is not None and limits.max_input_size is not None and self.length > limits.max_input_size
+
+    def check(self, idx, error_count):
+        """
+        Returns the reason to stop scanning at the offset, or None to go on.
+        """
+        if error_count >= self.max_errors:
+            return LIMIT_MAX_ERRORS
+        if idx >= self.stop and idx < self.length:
+            return LIMIT_MAX_CHARS
+        if idx >= self.checkpoint:
+            self.checkpoint = idx + DEADLINE_CHECK_INTERVAL
+            if time.perf_counter() > self.deadline:
+                return LIMIT_MAX_SECONDS
+        return None
+
+    def describe(self, reason, idx):
+        """
+        Returns the message of the error marking a truncated scan.
+        """
+        limits = self.limits
+        if reason == LIMIT_MAX_INPUT_SIZE:
+            return f'Input of {self.length:,} characters exceeds the limit of {limits.max_input_size:,}, nothing was scanned'
+        if reason == LIMIT_MAX_ERRORS:
+            return f'Stopped after {limits.max_errors:,} errors, the rest of the input was not scanned'
+        if reason == LIMIT_MAX_CHARS:
+            return f'Stopped after {idx:,} of {self.length:,} characters, the rest of the input was not scanned'
+        return f'Stopped after {limits.max_seconds:g} seconds at {idx:,} of {self.length:,} characters, the rest of the input was not scanned'
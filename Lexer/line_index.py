@@ -0,0 +1,82 @@
+from bisect import bisect_right
+
+from .source import find_line_starts, text_slice
+
+class LineIndex:
+    """
+    Maps character offsets of a file to zero-based line and column numbers.
+    The line-start offsets are computed once, the first time a position is resolved.
+
+    When only a window of the file is held in memory (see Lexer.stream), base is the
+    file offset of the window's first character, which starts a line, and first_line its line.
+    The text may also be an ASCII buffer (see Lexer.source); lines are decoded when they are rendered.
+    """
+    def __init__(self, fn, text, base=0, first_line=0):
+        self.fn = fn # filename
+        self.text = text # input text
+        self.base = base # file offset of text[0]
+        self.first_line = first_line # line of text[0]
+        self._line_starts = None # offset of the first character of every line
+
+    @property
+    def line_starts(self):
+        if self._line_starts is None:
+            self._line_starts = find_line_starts(self.text)
+        return self._line_starts
+
+    @line_starts.setter
+    def line_starts(self, starts):
+        # Line starts found by a pre-pass over the text (see Lexer.prepass)
+        self._line_starts = starts
+
+    def edit(self, text, offset, removed, inserted):
+        """
+        Replaces the indexed text in place with the result of an edit, so everything that references this index
+        resolves against the new text. Line starts already found are kept: the ones inside the edit are replaced
+        with those of the inserted text, and the later ones shifted.
+        """
+        starts = self._line_starts
+        self.text = text
+        if starts is None:
+            return
+        delta = len(inserted) - removed
+        lo = bisect_right(starts, offset)
+        hi = bisect_right(starts, offset + removed, lo)
+        shifted = [start + delta for start in starts[hi:]]
+        starts[lo:] = [start + offset for start in find_line_starts(inserted)[1:]] + shifted
+
+    def line_count(self):
+        """
+        Returns the number of lines up to the end of the indexed text.
+        """
+        return self.first_line + len(self.line_starts)
+
+    def line_of(self, idx):
+        """
+        Returns the zero-based line that contains the offset.
+        """
+        return self.first_line + bisect_right(self.line_starts, idx - self.base) - 1
+
+    def line_col(self, idx):
+        """
+        Returns the zero-based (line, column) of the offset.
+        """
+        idx -= self.base
+        ln = bisect_right(self.line_starts, idx) - 1
+        return self.first_line + ln, idx - self.line_starts[ln]
+
+    def line_text(self, ln):
+        """
+        Returns the text of a line without its newline character.
+        """
+        ln -= self.first_line
+        starts = self.line_starts
+        start = starts[ln]
+        end = starts[ln + 1] - 1 if ln + 1 < len(starts) else len(self.text)
+        return text_slice(self.text, start, end)
+
+    def slice(self, start, end):
+        """
+        Returns the text between two file offsets.
+        """
+        return text_slice(self.text, start - self.base, end - self.base)
@@ -0,0 +1,400 @@
+import json
+import re
+import sys
+from array import array
+from bisect import bisect_left
+
+from .incremental import diff_edit, common_prefix, common_suffix
+from .lexer import Lexer, BACKEND_REGEX
+from .tokens import *
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+SYNC_INCREMENTAL = 2 # TextDocumentSyncKind
+SEVERITY_ERROR = 1 # DiagnosticSeverity
+MESSAGE_ERROR = 1 # MessageType
+DIAGNOSTIC_SOURCE = 'mono'
+
+# Semantic token legend. Token types are LSP standard types; 'private' is a modifier of our own.
+SEMANTIC_TYPES = ('keyword', 'type', 'variable', 'number', 'string', 'comment', 'operator')
+SEMANTIC_MODIFIERS = ('readonly', 'private', 'documentation')
+
+MOD_READONLY = 1 << SEMANTIC_MODIFIERS.index('readonly')
+MOD_PRIVATE = 1 << SEMANTIC_MODIFIERS.index('private')
+MOD_DOCUMENTATION = 1 << SEMANTIC_MODIFIERS.index('documentation')
+
+
+def semantic(name, modifiers=0):
+    return SEMANTIC_TYPES.index(name), modifiers
+
+# Token type -> (semantic type index, modifier bits). Punctuation, newlines and the end of file are not highlighted.
+SEMANTIC_TOKENS = {
+    TT_IDENTIFIER: semantic('variable'),
+    TT_PRIV_IDENTIFIER: semantic('variable', MOD_PRIVATE),
+    TT_CONST_IDENTIFIER: semantic('variable', MOD_READONLY),
+    TT_PRIV_CONST_IDENTIFIER: semantic('variable', MOD_READONLY | MOD_PRIVATE),
+    TT_INTEGER: semantic('number'),
+    TT_FLOAT: semantic('number'),
+    TT_STRING: semantic('string'),
+    TT_BOOL: semantic('keyword'),
+    TT_DATA_TYPE: semantic('type'),
+    TT_KEYWORD: semantic('keyword'),
+    TT_RESERVED_WORD: semantic('keyword'),
+    TT_NOISE_WORD: semantic('keyword'),
+    TT_COMMENT: semantic('comment'),
+    TT_DOCSTRING: semantic('comment', MOD_DOCUMENTATION),
+}
+for tokentype in (TT_ASSIGNMENT, TT_PLUS, TT_MINUS, TT_MULTIPLY, TT_DIVIDE, TT_FLOOR_DIVIDE, TT_EXPONENT, TT_MODULO,
+                  TT_PLUS_ASSIGN, TT_MINUS_ASSIGN, TT_MULTIPLY_ASSIGN, TT_DIVIDE_ASSIGN, TT_FLOOR_DIVIDE_ASSIGN,
+                  TT_EXPONENT_ASSIGN, TT_MODULO_ASSIGN, TT_INCREMENT, TT_DECREMENT,
+                  TT_GREATER, TT_LESS, TT_GREATER_EQUAL, TT_LESS_EQUAL, TT_EQUAL, TT_NOT_EQUAL,
+                  TT_NOT, TT_AND, TT_OR):
+    SEMANTIC_TOKENS[tokentype] = semantic('operator')
+
+# Characters that take two UTF-16 code units
+ASTRAL = re.compile('[\U00010000-\U0010FFFF]')
+
+
+class Utf16Index:
+    """
+    Converts character offsets of a document to LSP positions, whose columns count UTF-16 code units, and back.
+    Only characters outside the Basic Multilingual Plane count twice, so their offsets are all that is kept.
+    """
+    def __init__(self, text, line_index):
+        self.text = text
+        self.line_index = line_index
+        self.astral = [] if text.isascii() else [match.start() for match in ASTRAL.finditer(text)]
+
+    def units(self, start, end):
+        """
+        Returns the length of text[start:end] in UTF-16 code units.
+        """
+        if not self.astral:
+            return end - start
+        return end - start + bisect_left(self.astral, end) - bisect_left(self.astral, start)
+
+    def position(self, offset):
+        offset = min(offset, len(self.text))
+        ln, col = self.line_index.line_col(offset)
+        return {"line": ln, "character": self.units(offset - col, offset)}
+
+    def offset(self, position):
+        """
+        Returns the offset of an LSP position. Positions past the end of a line resolve to its end.
+        """
+        starts = self.line_index.line_starts
+        ln = position["line"]
+        if ln >= len(starts):
+            return len(self.text)
+        start = starts[ln]
+        end = starts[ln + 1] - 1 if ln + 1 < len(starts) else len(self.text)
+        character = position["character"]
+        if not self.astral:
+            return min(start + character, end)
+
+        idx = start
+        units = 0
+        while idx < end and units < character:
+            units += 2 if ord(self.text[idx]) > 0xFFFF else 1
+            idx += 1
+        return idx
+
+
+class Document:
+    """
+    An open document, its lexer result, kept up to date with Lexer.relex as the document is edited,
+    and the semantic tokens last sent for it.
+    """
+    def __init__(self, uri, text, version):
+        self.uri = uri
+        self.version = version
+        self.lexer = Lexer(uri, text, backend=BACKEND_REGEX)
+        self.tokens, errors = self.lexer.scan_tokens()
+        self.errors = errors or []
+        self.positions = Utf16Index(text, self.lexer.line_index)
+
+        self.revision = 0 # number of changes applied
+        self.result_id = None
+        self.data = None # semantic token data of result_id
+        self.data_revision = None # revision the data was encoded from
+
+    @property
+    def text(self):
+        return self.lexer.text
+
+    def apply_change(self, change):
+        """
+        Applies one entry of a didChange contentChanges list.
+        """
+        if "range" in change:
+            offset = self.positions.offset(change["range"]["start"])
+            removed = self.positions.offset(change["range"]["end"]) - offset
+            inserted = change["text"]
+        else:
+            offset, removed, inserted = diff_edit(self.text, change["text"])
+
+        self.tokens, errors = self.lexer.relex(self.tokens, self.errors, offset, removed, inserted)
+        self.errors = errors or []
+        self.positions = Utf16Index(self.text, self.lexer.line_index)
+        self.revision += 1
+
+    def semantic_tokens(self):
+        """
+        Returns the semantic token data of the current version: five integers per highlighted token
+        (line delta, start delta, length, type, modifiers), with lexemes that span lines split per line.
+        """
+        if self.data_revision == self.revision:
+            return self.data
+
+        data = array('I')
+        append = data.extend
+        units = self.positions.units
+        astral = self.positions.astral
+        starts = self.lexer.line_index.line_starts
+        last_line = len(starts) - 1
+        ln = prev_line = prev_col = 0
+
+        for token in self.tokens:
+            kind = SEMANTIC_TOKENS.get(token.type)
+            if kind is None:
+                continue
+            start, end = token.start, token.end
+            while ln < last_line and starts[ln + 1] <= start:
+                ln += 1
+
+            while True:
+                next_start = starts[ln + 1] if ln < last_line else len(self.text) + 1
+                piece_end = min(end, next_start - 1)
+                if piece_end > start:
+                    if astral:
+                        col, length = units(starts[ln], start), units(start, piece_end)
+                    else:
+                        col, length = start - starts[ln], piece_end - start
+                    append((ln - prev_line, col - prev_col if ln == prev_line else col, length, kind[0], kind[1]))
+                    prev_line, prev_col = ln, col
+                if end <= next_start or ln == last_line:
+                    break
+                ln += 1
+                start = next_start
+        return data
+
+    def diagnostics(self):
+        positions = self.positions
+        return [{
+            "range": {"start": positions.position(error.start), "end": positions.position(error.end)},
+            "severity": SEVERITY_ERROR,
+            "code": error.error_name,
+            "source": DIAGNOSTIC_SOURCE,
+            "message": error.details or error.error_name,
+        } for error in self.errors]
+
+
+def semantic_tokens_edits(old, new):
+    """
+    Returns the SemanticTokensEdit list that turns the old data into the new: one edit replacing
+    the tokens between the unchanged head and tail, or none if nothing changed.
+    Since positions are relative, an edit only changes the tokens around it.
+    """
+    prefix = common_prefix(old, new) // 5 * 5
+    suffix = common_suffix(old, new, min(len(old), len(new)) - prefix) // 5 * 5
+
+    if prefix == len(old) == len(new):
+        return []
+    return [{"start": prefix, "deleteCount": len(old) - prefix - suffix,
+             "data": new[prefix:len(new) - suffix].tolist()}]
+
+
+class LanguageServer:
+    """
+    Language server for Mono over stdio: semantic tokens (full and delta) and lexical error diagnostics.
+    Documents are synced incrementally, and every change re-lexes only around the edit.
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.documents = {}
+        self.next_result_id = 0
+        self.initialized = False
+        self.shutdown = False
+
+        self.requests = {
+            'initialize': self.initialize,
+            'shutdown': self.on_shutdown,
+            'textDocument/semanticTokens/full': self.semantic_tokens_full,
+            'textDocument/semanticTokens/full/delta': self.semantic_tokens_delta,
+        }
+        self.notifications = {
+            'initialized': lambda params: None,
+            'textDocument/didOpen': self.did_open,
+            'textDocument/didChange': self.did_change,
+            'textDocument/didClose': self.did_close,
+        }
+
+    def run(self):
+        """
+        Serves messages until the client sends exit or closes the stream.
+
+        Returns:
+            int: The exit code: 0 if the client asked for a shutdown first, 1 otherwise.
+        """
+        while True:
+            try:
+                message = self.read_message()
+            except ValueError:
+                self.send_error(None, PARSE_ERROR, 'Parse error')
+                continue
+            if message is None or (isinstance(message, dict) and message.get('method') == 'exit'):
+                return 0 if self.shutdown else 1
+            if not isinstance(message, dict):
+                self.send_error(None, INVALID_REQUEST, 'Invalid request')
+                continue
+            self.dispatch(message)
+
+    def dispatch(self, message):
+        """
+        Runs the handler of one message. A request that fails is answered with an error; a notification
+        cannot be answered, so one that fails is only logged to the client and dropped.
+        """
+        method = message.get('method')
+        params = message.get('params') or {}
+        if 'id' not in message:
+            handler = self.notifications.get(method)
+            if handler is not None and self.initialized:
+                try:
+                    handler(params)
+                except Exception as exc:
+                    self.log_error(f'{method} failed: {type(exc).__name__}: {exc}')
+            return
+
+        handler = self.requests.get(method)
+        if handler is None:
+            self.send_error(message['id'], METHOD_NOT_FOUND, f'Method not found: {method}')
+        elif not self.initialized and method != 'initialize':
+            self.send_error(message['id'], SERVER_NOT_INITIALIZED, 'Server not initialized')
+        else:
+            try:
+                result = handler(params)
+            except KeyError as exc:
+                self.send_error(message['id'], INVALID_PARAMS, f'Missing or unknown {exc}')
+                return
+            except (TypeError, AttributeError) as exc:
+                # Params of the wrong shape, such as "textDocument": null
+                self.send_error(message['id'], INVALID_PARAMS, f'Invalid params: {exc}')
+                return
+            except Exception as exc:
+                self.send_error(message['id'], INTERNAL_ERROR, f'{type(exc).__name__}: {exc}')
+                return
+            self.send({"jsonrpc": "2.0", "id": message['id'], "result": result})
+
+    def initialize(self, params):
+        self.initialized = True
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16",
+                "textDocumentSync": {"openClose": True, "change": SYNC_INCREMENTAL},
+                "semanticTokensProvider": {
+                    "legend": {"tokenTypes": list(SEMANTIC_TYPES), "tokenModifiers": list(SEMANTIC_MODIFIERS)},
+                    "full": {"delta": True},
+                },
+            },
+            "serverInfo": {"name": "mono-lexer"},
+        }
+
+    def on_shutdown(self, params):
+        self.shutdown = True
+        return None
+
+    def did_open(self, params):
+        item = params["textDocument"]
+        document = Document(item["uri"], item["text"], item.get("version"))
+        self.documents[document.uri] = document
+        self.publish_diagnostics(document)
+
+    def did_change(self, params):
+        document = self.documents[params["textDocument"]["uri"]]
+        for change in params["contentChanges"]:
+            document.apply_change(change)
+        document.version = params["textDocument"].get("version")
+        self.publish_diagnostics(document)
+
+    def did_close(self, params):
+        uri = params["textDocument"]["uri"]
+        if self.documents.pop(uri, None) is not None:
+            self.send_notification('textDocument/publishDiagnostics', {"uri": uri, "diagnostics": []})
+
+    def semantic_tokens_full(self, params):
+        document = self.documents[params["textDocument"]["uri"]]
+        data = self.encode(document)
+        return {"resultId": document.result_id, "data": data.tolist()}
+
+    def semantic_tokens_delta(self, params):
+        document = self.documents[params["textDocument"]["uri"]]
+        old, old_id = document.data, document.result_id
+        data = self.encode(document)
+        if old is None or params.get("previousResultId") != old_id:
+            return {"resultId": document.result_id, "data": data.tolist()}
+        return {"resultId": document.result_id, "edits": semantic_tokens_edits(old, data)}
+
+    def encode(self, document):
+        """
+        Encodes the document's semantic tokens, under a new result id when they changed.
+        """
+        data = document.semantic_tokens()
+        if data is not document.data:
+            self.next_result_id += 1
+            document.result_id = str(self.next_result_id)
+            document.data = data
+            document.data_revision = document.revision
+        return data
+
+    def publish_diagnostics(self, document):
+        self.send_notification('textDocument/publishDiagnostics',
+                               {"uri": document.uri, "version": document.version, "diagnostics": document.diagnostics()})
+
+    def read_message(self):
+        """
+        Reads one message framed by a Content-Length header, or returns None at the end of the stream.
+        Raises ValueError if the header has no valid Content-Length or the JSON body is malformed.
+        """
+        length = None
+        while True:
+            line = self.reader.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                break
+            name, _, value = line.decode('ascii').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        if length is None or length < 0:
+            raise ValueError('Missing or invalid Content-Length header')
+        return json.loads(self.reader.read(length))
+
+    def send(self, message):
+        body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+        self.writer.write(b'Content-Length: %d\r\n\r\n' % len(body) + body)
+        self.writer.flush()
+
+    def send_notification(self, method, params):
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def send_error(self, msg_id, code, message):
+        self.send({"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}})
+
+    def log_error(self, message):
+        self.send_notification('window/logMessage', {"type": MESSAGE_ERROR, "message": message})
+
+
+def main():
+    return LanguageServer(sys.stdin.buffer, sys.stdout.buffer).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from .lexer import Lexer, BACKEND_REGEX
+from .line_index import LineIndex
+from .columnar import TokenColumns
+from .source import SOURCE_ENCODING, source_text
+from .tokens import *
+
+# Smallest chunk worth sending to another process; smaller inputs are lexed in place
+DEFAULT_CHUNK_SIZE = 1 << 22 # characters
+
+# Pre-scan: the lexemes that can span lines (docstrings and strings, as the master pattern matches them),
+# and everything else in between. Identifier and number runs are matched whole, since a '#' inside them
+# does not start a comment; comments stop before their newline. So every newline matched by CODE
+# is a NEWLINE token, after which the scanner starts afresh.
+PRESCAN_PATTERN = re.compile(r'''
+      (?P<DOCSTRING>""[\s\S]?[\s\S]*?(?:"""|\Z))
+    | (?P<STRING>"[^"\\]*(?:\\[\s\S]?[^"\\]*)*"?)
+    | (?P<CODE>(?:[A-Za-z_][A-Za-z0-9_$#@{}]*|(?:[0-9]|\.(?=[0-9]))[A-Za-z0-9_.$#@{}]*|\#[^\n]*|[^"])+)
+''', re.VERBOSE)
+
+
+def find_split_points(text, chunk_size):
+    """
+    Finds offsets at which the text can be lexed in independent pieces: just after a newline
+    outside strings, docstrings and comments, at least chunk_size characters apart.
+
+    Returns:
+        list: The split offsets in increasing order, without 0 and the end of the text.
+    """
+    splits = []
+    target = chunk_size
+    length = len(text)
+
+    for match in PRESCAN_PATTERN.finditer(text):
+        start, end = match.span()
+        while target < length and end > target and match.lastgroup == 'CODE':
+            newline = text.find('\n', max(start, target), end)
+            if newline < 0 or newline + 1 >= length:
+                break
+            splits.append(newline + 1)
+            target = newline + 1 + chunk_size
+        if target >= length:
+            break
+    return splits
+
+
+def lex_chunk(shm_name, byte_start, byte_end, base, first_line, fn, backend):
+    """
+    Lexes one chunk of the shared source in a worker process.
+    The chunk starts at a line start, so the line numbers in error messages only need its first line.
+
+    Returns:
+        tuple: The chunk's type codes, start offsets and end offsets as bytes, its values that differ from
+        their lexeme, and its errors without their line index. Offsets are file offsets.
+    """
+    shm = SharedMemory(name=shm_name)
+    try:
+        text = str(shm.buf[byte_start:byte_end], SOURCE_ENCODING)
+    finally:
+        shm.close()
+
+    lexer = Lexer(fn, text, backend=backend)
+    lexer.line_index = LineIndex(fn, text, first_line=first_line)
+    columns, errors = lexer.scan_columns()
+
+    starts = array('q', [start + base for start in columns.starts])
+    ends = array('q', [end + base for end in columns.ends])
+    errors = errors or []
+    for error in errors:
+        error.start += base
+        error.end += base
+        error.line_index = None
+    return columns.types.tobytes(), starts.tobytes(), ends.tobytes(), columns.values, errors
+
+
+def scan_parallel_columns(fn, text, workers=None, backend=BACKEND_REGEX, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lexes one large source in a process pool: the text is split at safe newlines, shared with the
+    workers through shared memory, and the chunk results are merged in order. The result is the
+    same as a sequential scan_columns; resource limits are not applied.
+
+    Returns:
+        TokenColumns: The tokens.
+        list: A list of errors, or None.
+    """
+    text = source_text(text, keep_ascii=False)
+    line_index = LineIndex(fn, text)
+    workers = workers or os.cpu_count() or 1
+    # Smaller chunks than the worker count allows, so the pool can balance uneven chunks
+    chunk_size = max(chunk_size, -(-len(text) // (workers * 4)))
+    splits = find_split_points(text, chunk_size)
+
+    if workers == 1 or not splits:
+        lexer = Lexer(fn, text, backend=backend)
+        lexer.line_index = line_index
+        return lexer.scan_columns()
+
+    # Chunk bounds in characters, lines and encoded bytes
+    bounds = [0, *splits, len(text)]
+    chunks = [text[start:end].encode(SOURCE_ENCODING) for start, end in zip(bounds, bounds[1:])]
+    shm = SharedMemory(create=True, size=max(1, sum(map(len, chunks))))
+    try:
+        tasks = []
+        byte_start = line = 0
+        for start, chunk in zip(bounds, chunks):
+            shm.buf[byte_start:byte_start + len(chunk)] = chunk
+            tasks.append((byte_start, byte_start + len(chunk), start, line))
+            byte_start += len(chunk)
+            line += chunk.count(b'\n')
+        del chunks
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = [pool.submit(lex_chunk, shm.name, *task, fn, backend) for task in tasks]
+            results = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return merge_chunks(text, line_index, results)
+
+
+def merge_chunks(text, line_index, results):
+    """
+    Joins the chunk results into one set of columns, keeping only the last chunk's end-of-file token.
+    """
+    columns = TokenColumns(text, line_index)
+    errors = []
+    last = len(results) - 1
+
+    for i, (types, starts, ends, values, chunk_errors) in enumerate(results):
+        rows = len(types) - (i != last)
+        row_base = len(columns)
+        columns.types.frombytes(types[:rows])
+        columns.starts.frombytes(starts[:rows * columns.starts.itemsize])
+        columns.ends.frombytes(ends[:rows * columns.ends.itemsize])
+        columns.values.update((row_base + row, value) for row, value in values.items() if row < rows)
+
+        for error in chunk_errors:
+            error.line_index = line_index
+        errors.extend(chunk_errors)
+
+    return columns, errors if errors else None
+
+
+def scan_parallel(fn, text, workers=None, backend=BACKEND_REGEX, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lexes one large source in a process pool, as scan_parallel_columns does.
+
+    Returns:
+        list: A list of tokens, equal to those of a sequential scan_tokens.
+        list: A list of errors, or None.
+    """
+    columns, errors = scan_parallel_columns(fn, text, workers, backend, chunk_size)
+    return [columns.token(row) for row in range(len(columns))], errors
@@ -1,20 +1,28 @@
 class Position:
-    def __init__(self, idx, ln, col, fn, ftext):
+    """
+    A character offset in a file. The line and column are resolved on demand from the file's line index.
+    """
+    __slots__ = ('idx', 'line_index')
+
+    def __init__(self, idx, line_index):
         self.idx = idx
-        self.ln = ln
-        self.col = col
-        self.fn = fn
-        self.ftext = ftext
+        self.line_index = line_index
+
+    @property
+    def ln(self):
+        return self.line_index.line_of(self.idx)
+
+    @property
+    def col(self):
+        return self.line_index.line_col(self.idx)[1]
 
-    def advance(self, current_char=None):
-        self.idx += 1
-        self.col += 1
+    @property
+    def fn(self):
+        return self.line_index.fn
 
-        if current_char == '\n':
-            self.ln += 1
-            self.col = 0
- 
-        return self
+    @property
+    def ftext(self):
+        return self.line_index.text
 
     def copy(self):
-        return Position(self.idx, self.ln, self.col, self.fn, self.ftext)
+        return Position(self.idx, self.line_index)
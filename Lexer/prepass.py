@@ -0,0 +1,80 @@
+from .char_validators import CLASS_TABLE_BYTES, CLASS_OTHER, CLASS_SPACE, CLASS_DOT, IDENTIFIER_CLASSES
+
+
+def require_numpy():
+    """
+    Imports NumPy for the pre-pass, which is the only part of the lexer that needs it.
+    """
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise ImportError("The 'prepass' lexer backend needs NumPy (pip install numpy)") from exc
+    return np
+
+
+def has_numpy():
+    try:
+        require_numpy()
+    except ImportError:
+        return False
+    return True
+
+
+class Boundaries:
+    """
+    Structure of a source text computed in bulk before scanning, with NumPy:
+    the class string of the text, its line starts, and for every offset the end of the run it belongs to.
+
+    word_end: for whitespace, the end of the whitespace run; for identifier characters, the end of the identifier run.
+    number_end: for identifier characters and dots, the end of the number run (an identifier run that may include dots).
+    Offsets outside such a run map to themselves.
+    """
+    def __init__(self, text):
+        np = require_numpy()
+        raw, codes = self.class_codes(np, text)
+        n = len(codes)
+
+        self.classes = codes.tobytes().decode('ascii')
+        self.line_starts = [0, *(np.flatnonzero(raw == 10) + 1).tolist()]
+        del raw
+
+        is_space = codes == ord(CLASS_SPACE)
+        is_word = np.isin(codes, np.frombuffer(IDENTIFIER_CLASSES.encode('ascii'), dtype=np.uint8))
+        is_number = is_word | (codes == ord(CLASS_DOT))
+
+        dtype = np.int32 if n < 2**31 - 1 else np.int64
+        word_end = np.where(is_space, self.run_ends(np, is_space, dtype), self.run_ends(np, is_word, dtype))
+        number_end = self.run_ends(np, is_number, dtype)
+
+        # Plain Python ints come out of a memoryview without a NumPy scalar per lookup
+        self.word_end = memoryview(np.ascontiguousarray(word_end))
+        self.number_end = memoryview(np.ascontiguousarray(number_end))
+
+    @staticmethod
+    def class_codes(np, text):
+        """
+        Returns the characters of the text as an array of code points, and the class code of every character
+        as a uint8 array.
+        """
+        table = np.frombuffer(CLASS_TABLE_BYTES, dtype=np.uint8)
+        if not isinstance(text, str):
+            raw = np.frombuffer(text, dtype=np.uint8)
+            return raw, table[raw]
+        if text.isascii():
+            raw = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+            return raw, table[raw]
+
+        # Code points past ASCII are CLASS_OTHER
+        raw = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        return raw, np.where(raw < 128, table[raw & 0x7f], np.uint8(ord(CLASS_OTHER)))
+
+    @staticmethod
+    def run_ends(np, mask, dtype):
+        """
+        Returns, for every offset where the mask is set, the end of the run of set offsets it is in,
+        and the offset itself elsewhere.
+        """
+        # The nearest unset offset at or after each offset, found by one running minimum from the end
+        n = len(mask)
+        unset = np.where(mask, dtype(n), np.arange(n, dtype=dtype))
+        return np.minimum.accumulate(unset[::-1])[::-1]
@@ -0,0 +1,211 @@
+import re
+
+from errors.base_error import Error
+from errors.lexer_errors import *
+from .line_index import LineIndex
+from .tokens import *
+from .classifiers import SymbolTable, classify_identifier, classify_number, unescape_string
+from .limits import ScanBudget, LIMIT_MAX_CHARS, LIMIT_MAX_INPUT_SIZE
+
+# Master pattern: one named group per lexeme class, tried in the same order as
+# the dispatch in Lexer.scan_tokens. Every character matches some alternative
+# (ILLEGAL is the catch-all), so finditer walks the input without gaps.
+MASTER_PATTERN = re.compile(r'''
+      (?P<SPACE>[ \t\v\r]+)
+    | (?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9_$#@{}]*)
+    | (?P<OPERATOR>//=|//|\+\+|--|[-+*/^%=<>!]=|&&|\|\||[-+*/^%=<>!&|])
+    | (?P<COMMENT>\#[^\n]*)
+    | (?P<NUMBER>(?:[0-9]|\.(?=[0-9]))[A-Za-z0-9_.$#@{}]*)
+    | (?P<DOCSTRING>""[\s\S]?(?P<DOC_BODY>[\s\S]*?)(?P<DOC_END>"""|\Z))
+    | (?P<STRING>"(?P<STR_BODY>[^"\\]*(?:\\[\s\S]?[^"\\]*)*)(?P<STR_END>"?))
+    | (?P<SPECIAL>[.,?:;\[\]()\\\n])
+    | (?P<ILLEGAL>[\s\S])
+''', re.VERBOSE)
+
+# The same pattern over bytes, for scanning ASCII buffers (see Lexer.source) in place
+MASTER_PATTERN_BYTES = re.compile(MASTER_PATTERN.pattern.encode('ascii'), re.VERBOSE)
+
+# Fixed-lexeme records keyed by the str lexeme and by its bytes, so buffer matches are looked up without decoding
+FIXED_MATCHES = {**FIXED_TOKENS, **{lexeme.encode('ascii'): record for lexeme, record in FIXED_TOKENS.items()}}
+
+def classify_match(match, line_index, base=0, symbols=None):
+    """
+    Classifies one master-pattern match without building a token, for scanners that store tokens their own way.
+    The base is the offset of the scanned text within the file. Matches over an ASCII buffer are decoded here,
+    one lexeme at a time.
+
+    With a SymbolTable, identifiers are classified once per distinct name. The (type, value) records of
+    identifiers and fixed lexemes are shared, so they must not be modified.
+
+    Returns:
+        tuple | Error: (token type, value) for a token, the error for the lexeme, or None for whitespace.
+    """
+    kind = match.lastgroup
+    if kind == 'SPACE':
+        return None
+
+    lexeme = match.group()
+    if kind == 'SPECIAL' or kind == 'OPERATOR':
+        record = FIXED_MATCHES.get(lexeme)
+        if record is not None:
+            return record
+    elif kind == 'IDENTIFIER' and symbols is not None:
+        record = symbols.identifier(lexeme)
+        if record is not None:
+            return record
+
+    if type(lexeme) is not str:
+        lexeme = lexeme.decode('ascii')
+
+    if kind == 'IDENTIFIER':
+        tokentype = classify_identifier(lexeme) if symbols is None else None
+        if tokentype is None:
+            return IllegalIdentifierError(match.start() + base, match.end() + base, line_index,
+                                          f"Invalid identifier '{lexeme}' does not follow snake_case naming convention.")
+        return tokentype, lexeme
+
+    elif kind == 'OPERATOR':
+        return InvalidRelationalSymbol(match.start() + base, match.end() + base, line_index,
+                                       f'"{lexeme}", Consider using "{INVALID_RELATIONAL[lexeme]}" instead.')
+
+    elif kind == 'COMMENT':
+        return TT_COMMENT, lexeme
+
+    start, end = match.span()
+    start += base
+    end += base
+
+    if kind == 'NUMBER':
+        tokentype, value, error = classify_number(lexeme)
+        if error is None:
+            return tokentype, value
+        return error(start, end, line_index, f'{value}')
+
+    elif kind == 'DOCSTRING':
+        if match.group('DOC_END'):
+            body = lexeme[match.start('DOC_BODY') - match.start():match.end('DOC_BODY') - match.start()]
+            return TT_DOCSTRING, '"""' + body.replace('""', '"') + '"""'
+
+        # The opening quotes always skip a third character, even past the end of the input
+        end = max(end, start + 3)
+        return Error(start, end, line_index,
+                     'Unterminated multi-line string literal', 'Multi-line string is not properly closed')
+
+    elif kind == 'STRING':
+        body = lexeme[1:len(lexeme) - len(match.group('STR_END'))]
+        if match.group('STR_END'):
+            return TT_STRING, unescape_string(body)
+
+        # A dangling backslash at the end of the input steps one past it
+        if (len(body) - len(body.rstrip('\\'))) % 2:
+            end += 1
+        return Error(start, end, line_index,
+                     'Unterminated string literal', 'String is not properly closed')
+
+    ln, col = line_index.line_col(start)
+    return IllegalCharError(start, end, line_index,
+                            f"Illegal character '{lexeme}' at line {ln + 1}, column {col + 1}")
+
+
+def match_result(match, line_index, base=0, symbols=None):
+    """
+    Converts one master-pattern match into its token or error.
+    The base is the offset of the scanned text within the file.
+
+    Returns:
+        Token | Error: The token or error for the lexeme, or None for whitespace.
+    """
+    result = classify_match(match, line_index, base, symbols)
+    if type(result) is tuple:
+        start, end = match.span()
+        return Token(result[0], result[1], start + base, end + base, line_index)
+    return result
+
+
+def eof_offset(length, errors):
+    """
+    Returns the offset of the end-of-file token: where a resource limit stopped the scan, or else the end
+    of the input. Unterminated literals can leave the pointer past the end of the input.
+    """
+    if errors and isinstance(errors[-1], TruncatedInputError):
+        return errors[-1].start
+    return max(length, errors[-1].end) if errors else length
+
+
+def eof_token(length, errors, line_index):
+    """
+    Builds the end-of-file token, at eof_offset.
+    """
+    return Token('TT_EOF', TT_EOF, eof_offset(length, errors), line_index=line_index)
+
+
+def truncation_error(idx, reason, budget, line_index):
+    """
+    Builds the error marking a scan stopped by a resource limit at the offset.
+    """
+    return TruncatedInputError(idx, idx + 1, line_index, budget.describe(reason, idx), reason)
+
+
+def truncated_eof(idx, reason, budget, tokens, errors, line_index):
+    """
+    Ends a scan stopped by a resource limit: the error marking the truncation, then the end-of-file token at the offset.
+    """
+    errors.append(truncation_error(idx, reason, budget, line_index))
+    tokens.append(Token('TT_EOF', TT_EOF, idx, line_index=line_index))
+    return tokens, errors
+
+
+def scan_matches(text, line_index, budget, errors):
+    """
+    Scans the input text with the compiled master pattern, yielding (start, end, (type, value)) for each
+    token and appending each error to `errors`, in input order. The text may be an ASCII buffer.
+
+    Once the budget reaches a limit, the scan stops at the same offset as the char backend and appends
+    the TruncatedInputError marking it; the end-of-file token then belongs at that offset (see eof_offset).
+    """
+    if budget.input_too_large():
+        errors.append(truncation_error(0, LIMIT_MAX_INPUT_SIZE, budget, line_index))
+        return
+    stop = budget.stop
+    symbols = SymbolTable()
+
+    pattern = MASTER_PATTERN if isinstance(text, str) else MASTER_PATTERN_BYTES
+    for match in pattern.finditer(text):
+        start = match.start()
+        if start >= budget.checkpoint or len(errors) >= budget.max_errors or match.end() > stop:
+            reason = budget.check(start, len(errors))
+            # The char backend steps through whitespace one character at a time, so it stops inside a run
+            if reason is None and match.lastgroup == 'SPACE' and match.end() > stop:
+                start, reason = stop, LIMIT_MAX_CHARS
+            if reason is not None:
+                errors.append(truncation_error(start, reason, budget, line_index))
+                return
+
+        result = classify_match(match, line_index, symbols=symbols)
+        if type(result) is tuple:
+            yield start, match.end(), result
+        elif result is not None:
+            errors.append(result)
+
+
+def scan_regex(fn, text, line_index=None, limits=None):
+    """
+    Scans the input text with the compiled master pattern instead of character by character.
+    With limits, the scan stops at the same offsets as the char backend and ends with a TruncatedInputError.
+    The text may be an ASCII buffer (bytes, memoryview or mmap), which is scanned without decoding it as a whole.
+
+    Returns:
+        list: A list of tokens.
+        list: A list of errors, or None.
+    """
+    if line_index is None:
+        line_index = LineIndex(fn, text)
+
+    tokens = []
+    errors = []
+    for start, end, (tokentype, value) in scan_matches(text, line_index, ScanBudget(limits, len(text)), errors):
+        tokens.append(Token(tokentype, value, start, end, line_index))
+
+    # End of File
+    tokens.append(eof_token(len(text), errors, line_index))
+    return tokens, errors if errors else None
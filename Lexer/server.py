@@ -0,0 +1,326 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .batch import token_record, error_record
+from .lexer import Lexer, BACKENDS, BACKEND_REGEX
+from .limits import LexerLimits
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Requests shorter than this are collected into batches; longer ones get a pool task of their own
+BATCH_MAX_CHARS = 1 << 16
+BATCH_MAX_REQUESTS = 64
+BATCH_WINDOW = 0.002 # seconds a batch stays open for more requests
+
+DEFAULT_MAX_PENDING = 256 # accepted requests not yet answered, beyond which requests are refused
+DEFAULT_PAGE_SIZE = 1000 # tokens per streamed message
+MAX_REQUEST_SIZE = 1 << 24 # bytes of one request line
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_BUSY = -32000
+
+
+class RequestError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def lex_request(fn, text, backend, limits, page_size):
+    """
+    Lexes one request's text. Runs in a worker process, so the tokens are returned already serialized,
+    as JSON arrays of at most page_size tokens each.
+
+    Returns:
+        tuple: (token count, token pages, error records, the limit that stopped the scan or None).
+    """
+    lexer = Lexer(fn, text, backend=backend, limits=limits)
+    tokens, errors = lexer.scan_tokens()
+    records = [token_record(token) for token in tokens]
+    pages = [json.dumps(records[i:i + page_size]) for i in range(0, len(records), page_size)]
+    return len(records), pages, [error_record(error) for error in errors or []], lexer.truncated
+
+
+def lex_batch(requests):
+    """
+    Lexes several requests in one pool task. A request that fails is returned as its exception,
+    so it does not fail the others.
+    """
+    results = []
+    for request in requests:
+        try:
+            results.append(lex_request(*request))
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+class LexServer:
+    """
+    Local lexing service speaking JSON-RPC 2.0, one JSON message per line, over TCP.
+
+    Small requests are collected for up to BATCH_WINDOW seconds into one pool task, so that their
+    process round trips are shared; large ones are lexed on their own. At most two tasks per worker
+    are handed to the pool at a time, the rest wait in the batch queue. Once max_pending requests are
+    waiting or running, further requests are refused at once with a SERVER_BUSY error instead of
+    queueing, which keeps the latency of accepted requests bounded.
+
+    A "lex" request is answered with "tokens" notifications carrying pages of tokens, written as the
+    client reads them, and then a result with the token count, the errors and the truncation reason.
+    """
+    def __init__(self, workers=None, backend=BACKEND_REGEX, limits=None, max_pending=DEFAULT_MAX_PENDING,
+                 batch_window=BATCH_WINDOW, page_size=DEFAULT_PAGE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.limits = limits
+        self.max_pending = max_pending
+        self.batch_window = batch_window
+        self.page_size = page_size
+
+        self.pool = None
+        self.queue = None
+        self.slots = None
+        self.batcher = None
+        self.pending = 0
+
+        # Counters reported by the "stats" method
+        self.served = 0
+        self.refused = 0
+        self.batches = 0
+        self.batched_requests = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(self.workers * 2)
+        self.batcher = asyncio.create_task(self.run_batches())
+        return await asyncio.start_server(self.handle_client, host, port, limit=MAX_REQUEST_SIZE)
+
+    async def close(self):
+        if self.batcher is not None:
+            self.batcher.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def lex(self, fn, text, backend):
+        """
+        Queues one text for lexing and waits for its result.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(((fn, text, backend, self.limits, self.page_size), future))
+        return await future
+
+    async def run_batches(self):
+        """
+        Takes requests off the queue, groups the small ones and submits the groups to the pool.
+        """
+        loop = asyncio.get_running_loop()
+        carry = None
+        while True:
+            first = carry if carry is not None else await self.queue.get()
+            carry = None
+            batch = [first]
+            size = len(first[0][1])
+
+            if size < BATCH_MAX_CHARS:
+                deadline = loop.time() + self.batch_window
+                while len(batch) < BATCH_MAX_REQUESTS and size < BATCH_MAX_CHARS:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if len(item[0][1]) >= BATCH_MAX_CHARS:
+                        # A large request starts its own task after this batch
+                        carry = item
+                        break
+                    batch.append(item)
+                    size += len(item[0][1])
+
+            await self.slots.acquire()
+            self.batches += 1
+            self.batched_requests += len(batch)
+            asyncio.create_task(self.run_batch(batch))
+
+    async def run_batch(self, batch):
+        try:
+            requests = [request for request, future in batch]
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(self.pool, lex_batch, requests)
+            except BrokenProcessPool as exc:
+                results = [exc] * len(batch)
+
+            for (request, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            self.slots.release()
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one connection. Requests on it are handled concurrently, and the messages of their
+        responses may interleave; every message carries the id of its request.
+        """
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self.send(writer, error_message(None, INVALID_REQUEST, 'Request too large'))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                task = asyncio.create_task(self.handle_message(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def handle_message(self, line, writer):
+        msg_id = None
+        try:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                raise RequestError(PARSE_ERROR, 'Parse error')
+            if not isinstance(message, dict) or not isinstance(message.get('method'), str):
+                raise RequestError(INVALID_REQUEST, 'Invalid request')
+            if 'id' not in message:
+                # A notification is never answered, and no method has an effect besides its answer
+                return
+
+            msg_id = message['id']
+            params = message.get('params') or {}
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, 'params must be an object')
+
+            method = message['method']
+            if method == 'lex':
+                await self.handle_lex(msg_id, params, writer)
+            elif method == 'stats':
+                await self.send(writer, result_message(msg_id, self.stats()))
+            else:
+                raise RequestError(METHOD_NOT_FOUND, f'Method not found: {method}')
+        except RequestError as exc:
+            await self.send(writer, error_message(msg_id, exc.code, exc.message))
+        except ConnectionError:
+            pass
+        except Exception as exc:
+            await self.send(writer, error_message(msg_id, INTERNAL_ERROR, f'{type(exc).__name__}: {exc}'))
+
+    async def handle_lex(self, msg_id, params, writer):
+        text = params.get('text')
+        fn = params.get('fn', '<request>')
+        backend = params.get('backend', self.backend)
+        if not isinstance(text, str):
+            raise RequestError(INVALID_PARAMS, 'text must be a string')
+        if backend not in BACKENDS:
+            raise RequestError(INVALID_PARAMS, f'backend must be one of {", ".join(BACKENDS)}')
+
+        # Admission control: refuse rather than queue once the server is saturated
+        if self.pending >= self.max_pending:
+            self.refused += 1
+            raise RequestError(SERVER_BUSY, 'Server busy, retry later')
+
+        self.pending += 1
+        try:
+            count, pages, errors, truncated = await self.lex(str(fn), text, backend)
+        finally:
+            self.pending -= 1
+
+        # The pages are already JSON; each is written once the client has taken the previous one
+        for page in pages:
+            writer.write(b'{"jsonrpc":"2.0","method":"tokens","params":{"id":%s,"tokens":%s}}\n'
+                         % (json.dumps(msg_id).encode(), page.encode()))
+            await writer.drain()
+        self.served += 1
+        await self.send(writer, result_message(msg_id, {"tokens": count, "errors": errors, "truncated": truncated}))
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "served": self.served,
+            "refused": self.refused,
+            "batches": self.batches,
+            "requests_per_batch": self.batched_requests / self.batches if self.batches else 0,
+        }
+
+    async def send(self, writer, message):
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+
+
+def result_message(msg_id, result):
+    return {"jsonrpc": "2.0", "id": msg_id, "result": result}
+
+
+def error_message(msg_id, code, message):
+    return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}}
+
+
+async def serve(host, port, server):
+    tcp_server = await server.start(host, port)
+    print(f'Lexing server on {host}:{port} with {server.workers} workers', flush=True)
+    try:
+        async with tcp_server:
+            await tcp_server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m Lexer.server', description='Serve the lexer over JSON-RPC on a local socket.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'address to listen on (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('-j', '--workers', type=int, help='worker processes (default: number of CPUs)')
+    parser.add_argument('--backend', choices=BACKENDS, default=BACKEND_REGEX, help='default scanning backend (default: regex)')
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING,
+                        help=f'requests waiting or running before new ones are refused (default: {DEFAULT_MAX_PENDING})')
+    parser.add_argument('--max-errors', type=int, help='stop lexing a request after this many errors')
+    parser.add_argument('--max-seconds', type=float, help='stop lexing a request after this many seconds')
+    parser.add_argument('--max-input-size', type=int, help='do not lex requests longer than this many characters')
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.max_pending < 1:
+        parser.error('--max-pending must be at least 1')
+
+    limits = LexerLimits(args.max_errors, args.max_seconds, max_input_size=args.max_input_size)
+    server = LexServer(args.workers, args.backend, limits, args.max_pending)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
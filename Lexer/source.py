@@ -0,0 +1,54 @@
+import re
+
+# Encoding of Mono source files
+SOURCE_ENCODING = 'utf-8'
+
+# Any byte outside ASCII; searched for in place, so a buffer is never copied to check it
+NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+NEWLINE = re.compile(rb'\n')
+
+
+def is_ascii(data):
+    """
+    Returns True if the bytes-like source holds only ASCII characters.
+    """
+    return NON_ASCII.search(data) is None
+
+
+def source_text(text, encoding=SOURCE_ENCODING, keep_ascii=True):
+    """
+    Returns the text to scan. A str is returned as is. A bytes-like source (bytes, bytearray, memoryview or mmap)
+    is returned as is when it is pure ASCII and keep_ascii is set, since its byte offsets are then its character
+    offsets; otherwise it is decoded in one pass.
+    """
+    if isinstance(text, str):
+        return text
+    if isinstance(text, memoryview) and text.itemsize != 1:
+        text = text.cast('B')
+    if keep_ascii and is_ascii(text):
+        return text
+    return str(text, encoding)
+
+
+def text_slice(text, start, end):
+    """
+    Returns text[start:end] as a str, decoding it when the text is an ASCII buffer.
+    """
+    lexeme = text[start:end]
+    return lexeme if type(lexeme) is str else str(lexeme, SOURCE_ENCODING, 'replace')
+
+
+def find_line_starts(text):
+    """
+    Returns the offset of the first character of every line of a str or a bytes-like text.
+    """
+    if not isinstance(text, str):
+        return [0, *(match.end() for match in NEWLINE.finditer(text))]
+
+    starts = [0]
+    idx = text.find('\n')
+    while idx >= 0:
+        starts.append(idx + 1)
+        idx = text.find('\n', idx + 1)
+    return starts
@@ -0,0 +1,110 @@
+import time
+
+# Lexer methods timed when profiling is enabled
+PROFILED_METHODS = (
+    'generate_identifier_token',
+    'generate_number_token',
+    'generate_string_or_docstring_token',
+    'make_multiline_string',
+    'generate_comment_token',
+    'generate_operator_token',
+    'generate_special_symbol_token',
+    'generate_illegal_char_error',
+)
+
+
+class StageStats:
+    """
+    Call count, cumulative time and characters consumed by one lexer method.
+    Time and characters of nested calls (make_multiline_string) are included in the caller as well.
+    """
+    __slots__ = ('calls', 'seconds', 'chars')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.chars = 0
+
+
+class KindStats:
+    """
+    Number of tokens or errors of one kind and the characters they span.
+    """
+    __slots__ = ('count', 'chars')
+
+    def __init__(self):
+        self.count = 0
+        self.chars = 0
+
+
+class LexerStats:
+    """
+    Profiling counters of one scan: per method and per token or error kind.
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self.stages = {} # method name -> StageStats
+        self.kinds = {} # token type or error name -> KindStats
+        self.chars = 0 # input length
+        self.seconds = 0.0 # whole scan
+
+    def instrument(self, lexer):
+        """
+        Replaces the lexer's generate_* methods with timing wrappers on this instance only,
+        so lexers without profiling run the plain methods.
+        """
+        for name in PROFILED_METHODS:
+            setattr(lexer, name, self.timed(lexer, name, getattr(lexer, name)))
+
+    def timed(self, lexer, name, method):
+        stage = self.stages.setdefault(name, StageStats())
+        perf_counter = time.perf_counter
+
+        def timed_method(*args):
+            idx = lexer.idx
+            start = perf_counter()
+            result = method(*args)
+            stage.seconds += perf_counter() - start
+            stage.calls += 1
+            stage.chars += lexer.idx - idx
+            return result
+        return timed_method
+
+    def finish(self, tokens, errors, chars, seconds):
+        """
+        Records the whole scan and counts its results per kind.
+        """
+        self.chars = chars
+        self.seconds = seconds
+        for token in tokens:
+            kind = self.kinds.setdefault(token.type, KindStats())
+            kind.count += 1
+            kind.chars += token.end - token.start
+        for error in errors or []:
+            kind = self.kinds.setdefault(error.error_name, KindStats())
+            kind.count += 1
+            kind.chars += error.end - error.start
+
+    def stage_rows(self):
+        """
+        Returns one dict per profiled method, slowest first.
+        """
+        rows = [{"Stage": name, "Calls": stage.calls, "Seconds": stage.seconds, "Chars": stage.chars}
+                for name, stage in self.stages.items() if stage.calls]
+        return sorted(rows, key=lambda row: row["Seconds"], reverse=True)
+
+    def kind_rows(self):
+        """
+        Returns one dict per token type or error name, most frequent first.
+        """
+        rows = [{"Kind": name, "Count": kind.count, "Chars": kind.chars} for name, kind in self.kinds.items()]
+        return sorted(rows, key=lambda row: row["Count"], reverse=True)
+
+    def as_dict(self):
+        return {
+            "backend": self.backend,
+            "chars": self.chars,
+            "seconds": self.seconds,
+            "stages": self.stage_rows(),
+            "kinds": self.kind_rows(),
+        }
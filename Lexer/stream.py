@@ -0,0 +1,97 @@
+import codecs
+
+from .line_index import LineIndex
+from .regex_scanner import MASTER_PATTERN, match_result
+from .tokens import *
+
+DEFAULT_CHUNK_SIZE = 1 << 16 # characters (or bytes) read per chunk
+
+
+def iter_tokens(fileobj, fn='<stream>', chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+    """
+    Lexes a text or binary file object chunk by chunk, yielding each token or error as soon as it is complete.
+
+    Only the unscanned tail of the input and the whole line it starts on are kept in memory, so memory
+    stays bounded by the chunk size and the longest line. A lexeme that runs into the end of a chunk
+    (a docstring, string or comment spanning chunks) is rescanned once more input has been read.
+    Tokens carry absolute file offsets; their positions resolve against the window they were scanned from.
+
+    An error is held back, with everything after it, until the end of its last line has been read, and
+    then resolves against a window holding all of its lines, so it renders as it does after scan_tokens.
+
+    Yields:
+        Token | Error: Tokens and errors in input order, ending with the TT_EOF token.
+    """
+    decoder = None
+    buffer = '' # unscanned text, preceded by the start of its line
+    base = 0 # file offset of buffer[0]
+    first_line = 0 # line of buffer[0]
+    pos = 0 # next unscanned index in buffer
+    held = [] # results from the first error whose lines are not complete yet on
+    last_error = None
+    eof = False
+
+    while not eof:
+        # Read at least as much again as is pending, so a long lexeme is rescanned a bounded number of times
+        chunk = fileobj.read(max(chunk_size, len(buffer) - pos))
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            eof = not chunk
+            chunk = decoder.decode(chunk, final=eof)
+        else:
+            eof = not chunk
+
+        # Drop scanned text up to the start of the current line, or of the first held error's line
+        keep = held[0].start - base if held else pos
+        cut = buffer.rfind('\n', 0, keep) + 1
+        if cut:
+            first_line += buffer.count('\n', 0, cut)
+            buffer = buffer[cut:]
+            base += cut
+            pos -= cut
+
+        buffer += chunk
+        line_index = LineIndex(fn, buffer, base, first_line)
+
+        for match in MASTER_PATTERN.finditer(buffer, pos):
+            # A match that reaches the end of the buffer may still grow with the next chunk
+            if match.end() == len(buffer) and not eof:
+                break
+
+            pos = match.end()
+            result = match_result(match, line_index, base)
+            if result is None:
+                continue
+            if not isinstance(result, Token):
+                last_error = result
+            if held or not isinstance(result, Token):
+                held.append(result)
+                if not isinstance(result, Token) or result.type == TT_NEWLINE:
+                    yield from release(held, buffer, base, line_index, eof)
+            else:
+                yield result
+        else:
+            pos = len(buffer)
+
+        yield from release(held, buffer, base, line_index, eof)
+
+    # End of File
+    eof_idx = max(base + len(buffer), last_error.end if last_error else 0)
+    yield Token('TT_EOF', TT_EOF, eof_idx, line_index=line_index)
+
+
+def release(held, buffer, base, line_index, eof):
+    """
+    Yields and removes the held results up to the first error whose last line does not end in the buffer yet.
+    The released errors are resolved against the current window, which holds their lines whole.
+    """
+    count = 0
+    for result in held:
+        if not isinstance(result, Token):
+            if not eof and buffer.find('\n', result.end - base) < 0:
+                break
+            result.line_index = line_index
+        count += 1
+    yield from held[:count]
+    del held[:count]
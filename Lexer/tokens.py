@@ -1,3 +1,7 @@
+from types import MappingProxyType
+
+from .position import Position
+
 # IDENTIFIER
 TT_IDENTIFIER = 'IDENTIFIER'
 TT_PRIV_IDENTIFIER = 'PRIV_IDENTIFIER'
@@ -76,23 +80,174 @@ TT_NEWLINE = 'NEWLINE'
 # END OF FILE
 TT_EOF = 'TT_EOF'
 
+# Every token type in a fixed order; the index of a type is its small-int code in columnar results
+TOKEN_TYPES = (
+    TT_IDENTIFIER, TT_PRIV_IDENTIFIER, TT_CONST_IDENTIFIER, TT_PRIV_CONST_IDENTIFIER,
+    TT_ASSIGNMENT, TT_PLUS, TT_MINUS, TT_MULTIPLY, TT_DIVIDE, TT_FLOOR_DIVIDE, TT_EXPONENT, TT_MODULO,
+    TT_PLUS_ASSIGN, TT_MINUS_ASSIGN, TT_MULTIPLY_ASSIGN, TT_DIVIDE_ASSIGN, TT_FLOOR_DIVIDE_ASSIGN,
+    TT_EXPONENT_ASSIGN, TT_MODULO_ASSIGN, TT_INCREMENT, TT_DECREMENT,
+    TT_GREATER, TT_LESS, TT_GREATER_EQUAL, TT_LESS_EQUAL, TT_EQUAL, TT_NOT_EQUAL,
+    TT_NOT, TT_AND, TT_OR,
+    TT_INTEGER, TT_FLOAT, TT_STRING, TT_BOOL, TT_DATA_TYPE, TT_KEYWORD, TT_RESERVED_WORD, TT_NOISE_WORD,
+    TT_COMMENT, TT_DOCSTRING,
+    TT_DOT, TT_COMMA, TT_QUESTION, TT_COLON, TT_SEMICOLON, TT_LSQUARE, TT_RSQUARE, TT_LPAREN, TT_RPAREN,
+    TT_LCURLY, TT_RCURLY, TT_BSLASH, TT_NEWLINE,
+    TT_EOF,
+)
+TYPE_CODES = MappingProxyType({tokentype: code for code, tokentype in enumerate(TOKEN_TYPES)})
+
+# ---- LEXEME TABLES ----
+
+# KEYWORDS
+KEYWORDS = ('any', 'as', 'break', 'catch', 'dict', 'elif', 'else', 'ensure', 'fn', 'for', 'if', 'in',
+            'input', 'input_int', 'print', 'return', 'skip', 'throw', 'try', 'while')
+
+# DATA TYPES
+DATA_TYPES = ('bool', 'float', 'int', 'str')
+
+# BOOLEAN VALUES
+BOOLS = ('true', 'false')
+
+# RESERVED WORDS
+RESERVED_WORDS = ('import', 'null')
+
+# NOISE WORDS
+NOISE_WORDS = ('do', 'end', 'start')
+
+# LOGICAL OPERATORS
+LOGICAL_WORDS = {'and': TT_AND, 'not': TT_NOT, 'or': TT_OR}
+
+# Prefixes of input_int that the keyword scanner has always reported as keywords
+INPUT_INT_PREFIXES = ('input_', 'input_i', 'input_in')
+
+# Token type of every word that is not an identifier
+WORD_TYPES = MappingProxyType({
+    **{word: TT_KEYWORD for word in KEYWORDS + INPUT_INT_PREFIXES},
+    **{word: TT_DATA_TYPE for word in DATA_TYPES},
+    **{word: TT_BOOL for word in BOOLS},
+    **{word: TT_RESERVED_WORD for word in RESERVED_WORDS},
+    **{word: TT_NOISE_WORD for word in NOISE_WORDS},
+    **LOGICAL_WORDS,
+})
+
+# ARITHMETIC, ASSIGNMENT AND RELATIONAL OPERATORS
+OPERATOR_TYPES = MappingProxyType({
+    '+': TT_PLUS,
+    '+=': TT_PLUS_ASSIGN,
+    '++': TT_INCREMENT,
+    '-': TT_MINUS,
+    '-=': TT_MINUS_ASSIGN,
+    '--': TT_DECREMENT,
+    '*': TT_MULTIPLY,
+    '*=': TT_MULTIPLY_ASSIGN,
+    '/': TT_DIVIDE,
+    '/=': TT_DIVIDE_ASSIGN,
+    '//': TT_FLOOR_DIVIDE,
+    '//=': TT_FLOOR_DIVIDE_ASSIGN,
+    '^': TT_EXPONENT,
+    '^=': TT_EXPONENT_ASSIGN,
+    '%': TT_MODULO,
+    '%=': TT_MODULO_ASSIGN,
+    '=': TT_ASSIGNMENT,
+    '==': TT_EQUAL,
+    '>': TT_GREATER,
+    '>=': TT_GREATER_EQUAL,
+    '<': TT_LESS,
+    '<=': TT_LESS_EQUAL,
+    '!=': TT_NOT_EQUAL,
+})
+
+# INVALID RELATIONAL SYMBOLS and the word to use instead
+INVALID_RELATIONAL = MappingProxyType({
+    '!': 'not',
+    '&': 'and',
+    '&&': 'and',
+    '|': 'or',
+    '||': 'or',
+})
+
+# Longest lexeme of either operator table
+OPERATOR_MAX_LEN = max(map(len, [*OPERATOR_TYPES, *INVALID_RELATIONAL]))
+
+# SPECIAL SYMBOLS
+SPECIAL_TYPES = MappingProxyType({
+    '.': TT_DOT,
+    ',': TT_COMMA,
+    '?': TT_QUESTION,
+    ':': TT_COLON,
+    ';': TT_SEMICOLON,
+    '[': TT_LSQUARE,
+    ']': TT_RSQUARE,
+    '(': TT_LPAREN,
+    ')': TT_RPAREN,
+    '\\': TT_BSLASH,
+    '\n': TT_NEWLINE,
+})
+
+# Type and value of every lexeme that always makes the same token; its tokens all share this one record
+FIXED_TOKENS = MappingProxyType({
+    **{lexeme: (tokentype, lexeme) for lexeme, tokentype in OPERATOR_TYPES.items()},
+    **{char: (tokentype, '\\n' if char == '\n' else char) for char, tokentype in SPECIAL_TYPES.items()},
+})
+
 class Token:
-    '''Stores the token type and value.'''
-    def __init__(self, type_, value=None, pos_start=None, pos_end=None):
+    '''
+    Stores the token type and value, and the offsets where the lexeme starts and ends.
+    Slotted, since a large input has hundreds of thousands of tokens; for a whole stream in even
+    less memory, see Lexer.columnar.TokenColumns.
+
+    The tokens after the last edit of an incrementally updated result (see Lexer.incremental) store their
+    offsets counted back from the end of the text, as negative numbers, so edits before them leave them as they are.
+    '''
+    __slots__ = ('type', 'value', '_start', '_end', 'line_index')
+
+    def __init__(self, type_, value=None, start=None, end=None, line_index=None):
         self.type = type_
         self.value = value
-        
-        if pos_start:
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
+        self._start = start
+        self._end = start + 1 if end is None and start is not None else end
+        self.line_index = line_index
 
-        if pos_end:
-            self.pos_end = pos_end.copy()
+    @property
+    def start(self):
+        start = self._start
+        return start if start is None or start >= 0 else len(self.line_index.text) + start + 1
+
+    @property
+    def end(self):
+        end = self._end
+        return end if end is None or end >= 0 else len(self.line_index.text) + end + 1
+
+    @property
+    def from_end(self):
+        '''Whether the offsets are counted back from the end of the text.'''
+        return self._start is not None and self._start < 0
+
+    def count_from_end(self, length):
+        '''Stores the offsets counted back from the end of a text of the given length.'''
+        self._start -= length + 1
+        self._end -= length + 1
+
+    def count_from_start(self, length):
+        '''Stores the offsets counted from the start of a text of the given length again.'''
+        self._start += length + 1
+        self._end += length + 1
+
+    @property
+    def code(self):
+        '''The small-int code of the token type, its index in TOKEN_TYPES.'''
+        return TYPE_CODES[self.type]
+
+    # Positions are only built when asked for
+    @property
+    def pos_start(self):
+        return Position(self.start, self.line_index)
+
+    @property
+    def pos_end(self):
+        return Position(self.end, self.line_index)
 
     # String representation of the token
     def __str__(self):
         if self.value: return f'{self.type}:{self.value}'
         return f'{self.type}'
-    
-
@@ -1,26 +1,24 @@
-def arrows(text, pos_start, pos_end):
+def arrows(line_index, idx_start, idx_end):
 	result = ''
 
-	# Calculate indices
-	idx_start = max(text.rfind('\n', 0, pos_start.idx), 0)
-	idx_end = text.find('\n', idx_start + 1)
-	if idx_end < 0: idx_end = len(text)
-	
+	# Resolve both ends once against the file's line index
+	ln_start, col_start = line_index.line_col(idx_start)
+	ln_end, col_end = line_index.line_col(idx_end)
+	ln_end = min(ln_end, line_index.line_count() - 1)
+
 	# Generate each line
-	line_count = pos_end.ln - pos_start.ln + 1
-	for i in range(line_count):
+	for ln in range(ln_start, ln_end + 1):
+		# Every line but the file's first is cut from the newline before it, which starts it on a line of its own
+		line = line_index.line_text(ln)
+		if ln > 0:
+			line = '\n' + line
+
 		# Calculate line columns
-		line = text[idx_start:idx_end]
-		col_start = pos_start.col if i == 0 else 0
-		col_end = pos_end.col if i == line_count - 1 else len(line) - 1
+		col_from = col_start if ln == ln_start else 0
+		col_to = col_end if ln == ln_end else len(line) - 1
 
 		# Append to result
 		result += line + '\n'
-		result += ' ' * col_start + '^' * (col_end - col_start)
-
-		# Re-calculate indices
-		idx_start = idx_end
-		idx_end = text.find('\n', idx_start + 1)
-		if idx_end < 0: idx_end = len(text)
+		result += ' ' * col_from + '^' * (col_to - col_from)
 
-	return result.replace('\t', '')
\ No newline at end of file
+	return result.replace('\t', '')
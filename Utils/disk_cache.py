@@ -0,0 +1,209 @@
+import hashlib
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+
+CACHE_FILE = 'tokens.sqlite3'
+SCHEMA_VERSION = 1
+
+# Seconds a connection waits for another process's write before giving up
+BUSY_TIMEOUT = 30
+
+# Failures of the database or its directory, which only make the cache miss
+CACHE_ERRORS = (sqlite3.Error, OSError)
+
+# One connection per database and process: workers open their own, and a connection never crosses a fork
+CONNECTIONS = {}
+
+
+class DiskTokenCache:
+    """
+    Persistent cache of lexer results shared by batch runs and their worker processes, stored in one
+    SQLite database in the cache directory. Entries are keyed by a hash of the content, the lexer
+    version and the limits that change the result, and hold the serialized tokens (compressed) and errors.
+
+    Worker processes look entries up and build new ones, which the parent stores in batches (put_many);
+    readers never block in WAL mode, so workers do not wait on each other. Recording use and evicting
+    least recently used entries beyond max_bytes happen once per run, in touch and evict.
+    A cache directory or database that cannot be opened, read or written only makes lookups miss.
+
+    The object is sent to worker processes by value, and each process opens its own connection.
+    """
+    def __init__(self, directory, max_bytes, version):
+        self.directory = directory
+        self.path = os.path.join(directory, CACHE_FILE)
+        self.max_bytes = max_bytes # size limit for all entries
+        self.version = version # lexer version the results belong to
+        self.hits = 0 # counters of the current run, kept by the parent process
+        self.misses = 0
+        self.evictions = 0
+
+    def connection(self):
+        key = (os.getpid(), self.path)
+        connection = CONNECTIONS.get(key)
+        if connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            # Autocommit: single statements commit on their own, and transactions are begun explicitly
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            CONNECTIONS[key] = connection
+            if connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                self.create_schema()
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs a block of statements as one write transaction, taking the write lock up front.
+        """
+        connection = self.connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def create_schema(self):
+        with self.transaction() as connection:
+            # Another process may have created it while this one waited for the lock
+            if connection.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION:
+                return
+            connection.execute('DROP TABLE IF EXISTS entries')
+            connection.execute('''CREATE TABLE entries (
+                key TEXT PRIMARY KEY,
+                token_count INTEGER NOT NULL,
+                error_count INTEGER NOT NULL,
+                truncated TEXT,
+                tokens BLOB,
+                errors TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL)''')
+            connection.execute('CREATE INDEX entries_last_used ON entries (last_used)')
+            connection.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def key(self, content, limits=None):
+        """
+        Returns the cache key of the content (a str or bytes-like object) for this lexer version and these limits.
+        Only the limits that can change a complete result are part of the key.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(self.version.encode())
+        if limits is not None:
+            digest.update(f'\0{limits.max_errors}\0{limits.max_input_size}'.encode())
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8', 'surrogatepass') if isinstance(content, str) else content)
+        return digest.hexdigest()
+
+    def get(self, key, with_tokens=True):
+        """
+        Returns the cached (token count, error count, truncated, tokens JSON, errors JSON), or None on a miss.
+        With with_tokens=False the tokens JSON is None; an entry stored without tokens only serves such lookups.
+        """
+        column = 'tokens' if with_tokens else 'NULL'
+        try:
+            row = self.connection().execute(
+                f'SELECT token_count, error_count, truncated, {column}, errors FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            token_count, error_count, truncated, tokens, errors = row
+            if with_tokens:
+                if tokens is None:
+                    return None
+                tokens = zlib.decompress(tokens).decode('utf-8')
+        except (*CACHE_ERRORS, zlib.error, UnicodeDecodeError):
+            return None
+        return token_count, error_count, truncated, tokens, errors
+
+    def entry(self, token_count, error_count, truncated, tokens, errors):
+        """
+        Builds the stored form of one result, compressing the tokens; tokens may be None when they were not serialized.
+        Worker processes build entries and the parent stores them, so only one process writes.
+
+        Returns:
+            tuple: The entry, or None if it is larger than the whole cache.
+        """
+        blob = zlib.compress(tokens.encode('utf-8'), 1) if tokens is not None else None
+        size = len(blob or b'') + len(errors)
+        if size > self.max_bytes:
+            return None
+        return token_count, error_count, truncated, blob, errors, size
+
+    def put_many(self, entries):
+        """
+        Stores (key, entry) pairs in one transaction.
+        """
+        now = time.time()
+        try:
+            with self.transaction() as connection:
+                connection.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                       ((key, *entry, now) for key, entry in entries))
+        except CACHE_ERRORS:
+            pass
+
+    def put(self, key, token_count, error_count, truncated, tokens, errors):
+        entry = self.entry(token_count, error_count, truncated, tokens, errors)
+        if entry is not None:
+            self.put_many([(key, entry)])
+
+    def touch(self, keys):
+        """
+        Marks entries as used now, in one transaction.
+        """
+        now = time.time()
+        try:
+            with self.transaction() as connection:
+                connection.executemany('UPDATE entries SET last_used = ? WHERE key = ?', ((now, key) for key in keys))
+        except CACHE_ERRORS:
+            pass
+
+    def evict(self):
+        """
+        Deletes least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: The number of entries deleted.
+        """
+        try:
+            with self.transaction() as connection:
+                excess = connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0] - self.max_bytes
+                if excess <= 0:
+                    return 0
+                evicted = []
+                for key, size in connection.execute('SELECT key, size FROM entries ORDER BY last_used'):
+                    evicted.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                connection.executemany('DELETE FROM entries WHERE key = ?', evicted)
+        except CACHE_ERRORS:
+            return 0
+        return len(evicted)
+
+    def clear(self):
+        try:
+            with self.transaction() as connection:
+                connection.execute('DELETE FROM entries')
+        except CACHE_ERRORS:
+            pass
+
+    def stats(self):
+        """
+        Returns the hit/miss counters of the run and the size of the cache, which is None if the cache is unavailable.
+        """
+        try:
+            entries, size = self.connection().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        except CACHE_ERRORS:
+            entries = size = None
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
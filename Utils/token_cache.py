@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+class TokenCache:
+    """
+    Process-wide LRU cache of lexer results, keyed by a hash of the content and the lexer version.
+    Entries are evicted least recently used first once their total size exceeds max_bytes.
+    Safe to share between threads (Streamlit sessions).
+    """
+    def __init__(self, max_bytes, version):
+        self.max_bytes = max_bytes # memory limit for all entries
+        self.version = version # lexer version the results belong to
+        self.entries = OrderedDict() # key -> (value, size), least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def key(self, content):
+        """
+        Returns the cache key of the content for this lexer version.
+        """
+        digest = hashlib.sha256(self.version.encode())
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached value, or None on a miss.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        """
+        Stores a value of the given size in bytes, evicting older entries to stay within the limit.
+        Values larger than the whole limit are not cached.
+        """
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """
+        Returns the hit/miss counters and the current memory use.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
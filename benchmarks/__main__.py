@@ -0,0 +1,108 @@
+import argparse
+import json
+import sys
+
+from Lexer.lexer import BACKENDS, available_backends
+from .corpus import PROFILES, generate_source
+from .runner import DEFAULT_SIZES, run_benchmarks
+from .compare import DEFAULT_THRESHOLD, compare_results, format_comparison
+from .startup import STARTUP_BUDGETS, check_startup
+from .fuzz import CHECKS, INPUT_CLASSES, REFERENCE_ORIGINAL, REFERENCE_WORKTREE, run_fuzz
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Lexer benchmarks.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='write generated Mono source to stdout')
+    generate.add_argument('--profile', choices=PROFILES, default='mixed')
+    generate.add_argument('--size', type=int, default=10_000, help='minimum number of characters')
+    generate.add_argument('--seed', type=int, default=0)
+
+    run = commands.add_parser('run', help='time the lexer on generated input')
+    run.add_argument('--profile', dest='profiles', action='append', choices=PROFILES, help='repeatable (default: all)')
+    run.add_argument('--size', dest='sizes', action='append', type=int, help=f'repeatable (default: {", ".join(map(str, DEFAULT_SIZES))})')
+    run.add_argument('--backend', dest='backends', action='append', choices=BACKENDS, help='repeatable (default: all installed)')
+    run.add_argument('--repeat', type=int, default=5, help='timed runs per benchmark, the best is kept')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--no-memory', action='store_true', help='skip the peak memory measurement')
+    run.add_argument('-o', '--output', help='write the results as JSON, e.g. a new baseline')
+
+    compare = commands.add_parser('compare', help='flag slowdowns against a baseline')
+    compare.add_argument('baseline', help='baseline results JSON')
+    compare.add_argument('current', help='current results JSON')
+    compare.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown (default: 0.10)')
+
+    startup = commands.add_parser('startup', help='check the import time of the lexer core and the command line')
+    startup.add_argument('--budget-ms', type=float, help='budget for every module (default: per module, up to '
+                                                        f'{max(STARTUP_BUDGETS.values())} ms)')
+    startup.add_argument('--repeat', type=int, default=5, help='timed imports per module, the best is kept')
+
+    fuzz = commands.add_parser('fuzz', help='check that every backend and lexing path reproduces the original lexer')
+    fuzz.add_argument('--check', dest='checks', action='append', choices=CHECKS,
+                      help='repeatable (default: all installed backends, stream, relex, columns and parallel)')
+    fuzz.add_argument('--class', dest='input_classes', action='append', choices=INPUT_CLASSES, help='repeatable (default: all)')
+    fuzz.add_argument('--count', type=int, default=1000, help='inputs per class')
+    fuzz.add_argument('--max-size', type=int, default=200, help='maximum number of characters of a generated program')
+    fuzz.add_argument('--seed', type=int, default=0)
+    fuzz.add_argument('-o', '--output', help='write the results and reproducers as JSON')
+    fuzz.add_argument('--reference', default=REFERENCE_ORIGINAL,
+                      help=f'{REFERENCE_ORIGINAL} for the copy of the original lexer in benchmarks/reference, '
+                           f'{REFERENCE_WORKTREE} for the current char backend, or a git revision (default: {REFERENCE_ORIGINAL})')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        sys.stdout.write(generate_source(args.size, args.profile, args.seed))
+        return 0
+
+    if args.command == 'run':
+        report = run_benchmarks(
+            profiles=args.profiles or tuple(PROFILES),
+            sizes=args.sizes or DEFAULT_SIZES,
+            backends=args.backends or available_backends(),
+            repeat=args.repeat,
+            seed=args.seed,
+            measure_memory=not args.no_memory,
+            log=print,
+        )
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                json.dump(report, out, indent=2)
+                out.write('\n')
+        return 0
+
+    if args.command == 'fuzz':
+        try:
+            report = run_fuzz(
+                checks=args.checks,
+                input_classes=args.input_classes or INPUT_CLASSES,
+                count=args.count,
+                seed=args.seed,
+                max_size=args.max_size,
+                reference_revision=args.reference,
+                log=print,
+            )
+        except (OSError, RuntimeError) as exc:
+            print(f'Cannot run the reference lexer {args.reference}: {exc}', file=sys.stderr)
+            print(f'Use --reference {REFERENCE_ORIGINAL} or --reference {REFERENCE_WORKTREE} instead', file=sys.stderr)
+            return 2
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                json.dump(report, out, indent=2)
+                out.write('\n')
+        return 1 if any(result["mismatches"] for result in report["results"]) else 0
+
+    if args.command == 'startup':
+        budgets = STARTUP_BUDGETS
+        if args.budget_ms is not None:
+            budgets = {module: args.budget_ms for module in budgets}
+        return 0 if check_startup(budgets, args.repeat) else 1
+
+    with open(args.baseline, encoding='utf-8') as baseline, open(args.current, encoding='utf-8') as current:
+        rows = compare_results(json.load(baseline), json.load(current), args.threshold)
+    print(format_comparison(rows, args.threshold))
+    return 1 if any(row[4] for row in rows) else 0
+
+
+sys.exit(main())
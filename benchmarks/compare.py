@@ -0,0 +1,35 @@
+DEFAULT_THRESHOLD = 0.10 # slowdowns above 10% are flagged
+
+
+def result_key(result):
+    return result["profile"], result["size"], result["backend"]
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares chars/sec of every (profile, size, backend) present in both runs.
+
+    Returns:
+        list: One row per shared entry: (key, baseline chars/sec, current chars/sec, change, flagged).
+    """
+    baseline_results = {result_key(result): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        key = result_key(result)
+        if key not in baseline_results:
+            continue
+        before = baseline_results[key]["chars_per_sec"]
+        after = result["chars_per_sec"]
+        change = after / before - 1
+        rows.append((key, before, after, change, change < -threshold))
+    return rows
+
+
+def format_comparison(rows, threshold=DEFAULT_THRESHOLD):
+    lines = [f"{'profile':<12} {'size':>10} {'backend':<7} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for (profile, size, backend), before, after, change, flagged in rows:
+        lines.append(f"{profile:<12} {size:>10,} {backend:<7} {before / 1e6:10.2f} {after / 1e6:10.2f} {change:+8.1%}"
+                     + ("  SLOWER" if flagged else ""))
+    slower = sum(row[4] for row in rows)
+    lines.append(f"{slower} of {len(rows)} benchmarks slower than the baseline by more than {threshold:.0%} (Mchar/s)")
+    return '\n'.join(lines)
@@ -0,0 +1,126 @@
+import random
+
+# Relative weight of each kind of line per input profile
+PROFILES = {
+    'mixed': {'identifiers': 5, 'keywords': 3, 'numbers': 2, 'strings': 1, 'docstrings': 0.2,
+              'comments': 1, 'operators': 3, 'errors': 0.05},
+    'identifiers': {'identifiers': 10, 'keywords': 4, 'numbers': 0.5, 'strings': 0.2, 'docstrings': 0,
+                    'comments': 0.2, 'operators': 1, 'errors': 0},
+    'literals': {'identifiers': 1, 'keywords': 0.5, 'numbers': 0.5, 'strings': 4, 'docstrings': 1,
+                 'comments': 4, 'operators': 0.5, 'errors': 0},
+    'numbers': {'identifiers': 1, 'keywords': 0.5, 'numbers': 10, 'strings': 0.2, 'docstrings': 0,
+                'comments': 0.2, 'operators': 3, 'errors': 0},
+    'errors': {'identifiers': 3, 'keywords': 1, 'numbers': 1, 'strings': 0.5, 'docstrings': 0,
+               'comments': 0.5, 'operators': 1, 'errors': 3},
+}
+
+SYLLABLES = ('ba', 'co', 'de', 'fi', 'ga', 'lo', 'mu', 'ne', 'pi', 'ra', 'su', 'ta', 'vo', 'xe', 'zu')
+WORDS = ('the', 'value', 'of', 'total', 'count', 'is', 'stored', 'here', 'when', 'items', 'change', 'result')
+ARITHMETIC = ('+', '-', '*', '/', '//', '%', '^')
+ASSIGNMENT = ('=', '+=', '-=', '*=', '/=', '//=', '%=', '^=')
+RELATIONAL = ('==', '!=', '<', '>', '<=', '>=')
+DATA_TYPES = ('int', 'float', 'str', 'bool')
+
+# Lines with one deliberate lexical error each
+ERROR_LINES = (
+    'camelCase = 1',
+    'value = $price',
+    'ratio = 1..2',
+    'count = 12abc',
+    'ok = left && right',
+    'big = 1__000',
+    'flag = !ready',
+    'Mixed_Case = 3',
+    'cost = @total',
+    'rate = 1.2.3',
+)
+
+
+class SourceGenerator:
+    """
+    Generates realistic, reproducible Mono source for one profile from a seed.
+    """
+    def __init__(self, profile='mixed', seed=0, names=200):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{profile}', expected one of {', '.join(PROFILES)}")
+
+        self.rng = random.Random(f'{profile}:{seed}')
+        self.kinds = list(PROFILES[profile])
+        self.weights = [PROFILES[profile][kind] for kind in self.kinds]
+
+        # Real code repeats a limited set of names
+        self.names = [self.make_name() for _ in range(names)]
+        self.constants = [name.upper() for name in self.names[:names // 10]]
+
+    def make_name(self):
+        rng = self.rng
+        parts = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(rng.randint(1, 3))]
+        return ('_' if rng.random() < 0.05 else '') + '_'.join(parts)
+
+    def name(self):
+        return self.rng.choice(self.names)
+
+    def number(self):
+        rng = self.rng
+        if rng.random() < 0.6:
+            return str(rng.randint(0, 10 ** rng.randint(1, 6)))
+        return f'{rng.uniform(0, 1000):.{rng.randint(1, 4)}f}'
+
+    def words(self, low, high):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high)))
+
+    def line(self):
+        rng = self.rng
+        kind = rng.choices(self.kinds, self.weights)[0]
+
+        if kind == 'identifiers':
+            return f'{self.name()} = {self.name()} {rng.choice(ARITHMETIC)} {self.name()}'
+        elif kind == 'keywords':
+            return rng.choice((
+                f'if {self.name()} {rng.choice(RELATIONAL)} {self.name()} and not {self.name()}:',
+                f'while {self.name()} {rng.choice(RELATIONAL)} {self.number()} do',
+                f'for {self.name()} in {self.name()} do',
+                f'fn {self.name()}({self.name()}: {rng.choice(DATA_TYPES)}, {self.name()}):',
+                f'return {self.name()}',
+                f'print({self.name()}, {rng.choice(("true", "false", "null"))})',
+                'else:',
+                'end',
+            ))
+        elif kind == 'numbers':
+            return f'{rng.choice(self.constants)} = {self.number()} {rng.choice(ARITHMETIC)} {self.number()}'
+        elif kind == 'strings':
+            escape = '\\"' if rng.random() < 0.2 else ''
+            return f'{self.name()} = "{self.words(1, 8)}{escape}"'
+        elif kind == 'docstrings':
+            body = '\n'.join(self.words(3, 10) for _ in range(rng.randint(1, 6)))
+            return f'"""\n{body}\n"""'
+        elif kind == 'comments':
+            return f'# {self.words(2, 12)}'
+        elif kind == 'operators':
+            return f'{self.name()} {rng.choice(ASSIGNMENT)} ({self.name()} {rng.choice(ARITHMETIC)} {self.number()}) {rng.choice(ARITHMETIC)} {self.name()}'
+        return rng.choice(ERROR_LINES)
+
+    def generate(self, size):
+        """
+        Returns at least `size` characters of source, ending with a complete line.
+        """
+        lines = []
+        length = 0
+        depth = 0
+        while length < size:
+            line = '    ' * depth + self.line()
+            # Blocks open after lines ending in ':' or 'do' and close again at random
+            if line.endswith(':') or line.endswith(' do'):
+                depth = min(depth + 1, 4)
+            elif depth and self.rng.random() < 0.2:
+                depth -= 1
+            lines.append(line)
+            length += len(line) + 1
+        return '\n'.join(lines) + '\n'
+
+
+def generate_source(size, profile='mixed', seed=0):
+    """
+    Returns at least `size` characters of reproducible Mono source for the profile.
+    """
+    return SourceGenerator(profile, seed).generate(size)
@@ -0,0 +1,360 @@
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+from Lexer.lexer import Lexer, BACKENDS, BACKEND_REGEX, available_backends
+from Lexer.incremental import diff_edit
+from Lexer.stream import iter_tokens
+from Lexer.tokens import KEYWORDS, DATA_TYPES, BOOLS, RESERVED_WORDS, NOISE_WORDS, LOGICAL_WORDS, INPUT_INT_PREFIXES, Token
+from .corpus import PROFILES, ERROR_LINES, SourceGenerator
+from .oracle import FILENAME, timed_outcome
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The original character-by-character Lexer, which every backend must reproduce: the baseline with only the
+# fixes that gave it a result for every input ('~' looped forever, "'" added None to the tokens).
+# It runs from its own copy of the sources in benchmarks/reference, so a regression in code the backends
+# share still shows, and the copy stays put however the history is rewritten.
+REFERENCE_ORIGINAL = 'original'
+REFERENCE_DIRECTORY = os.path.join(ROOT, 'benchmarks', 'reference')
+# Any other reference is a git revision, exported from these paths
+REFERENCE_PATHS = ('Lexer', 'errors', 'Utils')
+# Stands for the working tree's char backend
+REFERENCE_WORKTREE = 'worktree'
+
+# Other ways the lexer produces a result, each checked against a fresh scan_tokens of the same text
+PATH_CHECKS = ('stream', 'relex', 'columns', 'parallel')
+CHECKS = (*BACKENDS, *PATH_CHECKS)
+
+STREAM_CHUNK_SIZES = (1, 2, 3, 5, 8, 13, 64)
+PARALLEL_BATCH = 100 # inputs joined into one text per parallel scan, which starts a process pool
+PARALLEL_WORKERS = (2, 3, 4)
+
+# Kinds of generated input, reported separately
+INPUT_CLASSES = ('grammar', 'mutated', 'soup')
+
+# Pieces the mutated and soup inputs are made of: words the lexer treats specially, lexemes near
+# the edge of an error, and characters of every class, including ones Mono does not allow
+FRAGMENTS = (
+    *KEYWORDS, *DATA_TYPES, *BOOLS, *RESERVED_WORDS, *NOISE_WORDS, *LOGICAL_WORDS, *INPUT_INT_PREFIXES,
+    'input_int_', 'integer', 'int_', 'string', 'Int', 'FOO', '_x', '_X', 'snake_case', 'camelCase', 'a__b',
+    '1..2', '1.5', '.5', '5.', '1.2.3', '1__2', '1_2', '12a', '1a', '0', '007',
+    '"', '""', '"""', '"a\\"b"', '\\', '#', '# c\n', "'",
+    '+', '-', '*', '/', '//', '%', '^', '=', '==', '!=', '<', '>', '<=', '>=', '+=', '//=', '&&', '||', '!',
+    '(', ')', '[', ']', '{', '}', ',', ':', ';', '.', '$', '@', '~', '?', '&', '|',
+    ' ', '    ', '\t', '\n', '\r', '\r\n', '\v', '\f', 'é', 'ß', '€', '\U0001f600', '\x00',
+)
+
+
+class InputGenerator:
+    """
+    Generates reproducible fuzzing inputs of each class from a seed: 'grammar' inputs are short programs from
+    the benchmark corpus generator, 'mutated' ones are such programs with fragments inserted, deleted, repeated
+    or swapped, and 'soup' inputs are fragments strung together at random.
+    """
+    def __init__(self, seed=0, max_size=200):
+        self.rng = random.Random(f'fuzz:{seed}')
+        self.max_size = max_size
+        self.programs = [SourceGenerator(profile, seed) for profile in PROFILES]
+
+    def generate(self, input_class):
+        if input_class == 'grammar':
+            return self.program()
+        elif input_class == 'mutated':
+            return self.mutate(self.program())
+        elif input_class == 'soup':
+            return self.soup()
+        raise ValueError(f"Unknown input class '{input_class}', expected one of {', '.join(INPUT_CLASSES)}")
+
+    def program(self):
+        rng = self.rng
+        text = rng.choice(self.programs).generate(rng.randint(1, self.max_size))
+        if rng.random() < 0.3:
+            # Inputs also end without a final newline
+            text = text.rstrip('\n')
+        return text
+
+    def soup(self):
+        rng = self.rng
+        parts = []
+        length = 0
+        size = rng.randint(0, self.max_size)
+        while length < size:
+            part = rng.choice(FRAGMENTS) if rng.random() < 0.7 else rng.choice(ERROR_LINES)
+            parts.append(part)
+            length += len(part)
+        return ''.join(parts)
+
+    def mutate(self, text):
+        rng = self.rng
+        for _ in range(rng.randint(1, 4)):
+            at = rng.randint(0, len(text))
+            span = rng.randint(1, 8)
+            operation = rng.randrange(4)
+            if operation == 0:
+                text = text[:at] + rng.choice(FRAGMENTS) + text[at:]
+            elif operation == 1:
+                text = text[:at] + text[at + span:]
+            elif operation == 2:
+                text = text[:at] + text[at:at + span] * rng.randint(2, 4) + text[at + span:]
+            else:
+                text = text[:at] + rng.choice(FRAGMENTS) + text[at + span:]
+        return text
+
+
+class ReferenceLexer:
+    """
+    Lexes texts with the original Lexer in benchmarks/reference, or the Lexer of a git revision exported to
+    a temporary directory, run in a subprocess (see benchmarks.oracle). With REFERENCE_WORKTREE, the working
+    tree's char backend is used in process.
+
+    Raises RuntimeError if git cannot export the revision.
+    """
+    def __init__(self, revision=REFERENCE_ORIGINAL):
+        self.revision = revision
+        self.directory = None
+        self.process = None
+        if revision == REFERENCE_WORKTREE:
+            return
+
+        if revision == REFERENCE_ORIGINAL:
+            source = REFERENCE_DIRECTORY
+        else:
+            self.directory = tempfile.TemporaryDirectory(prefix='mono-reference-')
+            source = self.directory.name
+            self.export(revision, source)
+        self.process = subprocess.Popen([sys.executable, '-m', 'benchmarks.oracle', source], cwd=ROOT,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding='utf-8')
+
+    def export(self, revision, directory):
+        """
+        Extracts the lexer sources of a git revision into the directory.
+        """
+        archive = os.path.join(directory, 'reference.zip')
+        try:
+            subprocess.run(['git', 'archive', '--format=zip', '-o', archive, revision, *REFERENCE_PATHS],
+                           cwd=ROOT, capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError) as exc:
+            self.close()
+            reason = getattr(exc, 'stderr', None) or str(exc)
+            raise RuntimeError(f"git cannot export revision '{revision}': {reason.strip()}") from exc
+        with zipfile.ZipFile(archive) as zipped:
+            zipped.extractall(directory)
+
+    def scan(self, texts):
+        """
+        Returns the (outcome, seconds) of each text.
+        """
+        if self.process is None:
+            return [timed_outcome(lambda: Lexer(FILENAME, text).scan_tokens()) for text in texts]
+        self.process.stdin.write(json.dumps(texts) + '\n')
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f'The reference lexer of {self.revision} exited')
+        return json.loads(line)
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+        if self.directory is not None:
+            self.directory.cleanup()
+
+
+def normalized(result):
+    """
+    Returns an (outcome, seconds) pair with the outcome as it comes back from the reference process.
+    """
+    outcome, seconds = result
+    return json.loads(json.dumps(outcome)), seconds
+
+
+def split_stream(items):
+    tokens = [item for item in items if isinstance(item, Token)]
+    return tokens, [item for item in items if not isinstance(item, Token)]
+
+
+def prepare_scan(check, text, parameter):
+    """
+    Does the setup one check needs for the text, such as lexing the text before the edit for relex,
+    and returns the scan to time: a function returning tokens (or columns) and errors.
+    """
+    if check in BACKENDS:
+        return lambda: Lexer(FILENAME, text, backend=check).scan_tokens()
+    if check == 'stream':
+        return lambda: split_stream(list(iter_tokens(io.StringIO(text), FILENAME, parameter)))
+    if check == 'relex':
+        lexer = Lexer(FILENAME, parameter)
+        tokens, errors = lexer.scan_tokens()
+        return lambda: lexer.relex(tokens, errors, *diff_edit(parameter, text))
+    if check == 'columns':
+        return lambda: Lexer(FILENAME, text, backend=BACKEND_REGEX).scan_columns()
+    # Imported here: the process pool is only needed by this check
+    from Lexer.parallel import scan_parallel_columns
+    return lambda: scan_parallel_columns(FILENAME, text, workers=parameter, chunk_size=1)
+
+
+def check_cases(check, inputs, generator, rng):
+    """
+    Returns the (text, parameter) cases of a check: the parameter is the chunk size for stream, the text
+    before a random edit for relex, and the number of workers for parallel, which lexes batches of inputs
+    joined into one text.
+    """
+    if check == 'stream':
+        return [(text, rng.choice(STREAM_CHUNK_SIZES)) for text in inputs]
+    if check == 'relex':
+        return [(text, generator.mutate(text)) for text in inputs]
+    if check == 'parallel':
+        return [('\n'.join(inputs[i:i + PARALLEL_BATCH]), rng.choice(PARALLEL_WORKERS))
+                for i in range(0, len(inputs), PARALLEL_BATCH)]
+    return [(text, None) for text in inputs]
+
+
+class Checker:
+    """
+    Runs one check and its expected result: backends are compared with the reference lexer, the other
+    paths with a fresh scan_tokens of the working tree.
+    """
+    def __init__(self, check, reference):
+        self.check = check
+        self.reference = reference if check in BACKENDS else None
+
+    def expected(self, texts):
+        if self.reference is not None:
+            return self.reference.scan(texts)
+        return [normalized(timed_outcome(lambda: Lexer(FILENAME, text).scan_tokens())) for text in texts]
+
+    def actual(self, text, parameter):
+        return normalized(timed_outcome(prepare_scan(self.check, text, parameter)))
+
+    def fails(self, text, parameter):
+        return self.expected([text])[0][0] != self.actual(text, parameter)[0]
+
+    def reproducer(self, text, parameter):
+        """
+        Shrinks a failing case: the text, and for relex also the text before the edit.
+        """
+        text = shrink(text, lambda candidate: self.fails(candidate, parameter))
+        if self.check == 'relex':
+            parameter = shrink(parameter, lambda candidate: self.fails(text, candidate))
+        reproducer = {"input": text}
+        if parameter is not None:
+            reproducer[{'stream': 'chunk_size', 'relex': 'edited_from', 'parallel': 'workers'}[self.check]] = parameter
+        reproducer["difference"] = first_difference(self.expected([text])[0][0], self.actual(text, parameter)[0])
+        return reproducer
+
+
+def shrink(text, fails):
+    """
+    Reduces an input for which fails(text) is true to a minimal one for which it is still true: whole lines
+    are removed first, then ever smaller spans of characters, until no single character can be removed.
+    """
+    lines = text.splitlines(keepends=True)
+    i = 0
+    while i < len(lines) and len(lines) > 1:
+        candidate = lines[:i] + lines[i + 1:]
+        if fails(''.join(candidate)):
+            lines = candidate
+        else:
+            i += 1
+    text = ''.join(lines)
+
+    span = max(len(text) // 2, 1)
+    while True:
+        i = 0
+        while i < len(text):
+            candidate = text[:i] + text[i + span:]
+            if fails(candidate):
+                text = candidate
+            else:
+                i += span
+        if span == 1:
+            return text
+        span //= 2
+
+
+def first_difference(expected, actual):
+    """
+    Describes where two scan outcomes first differ.
+    """
+    if expected[0] == 'exception' or actual[0] == 'exception':
+        return f'expected {expected!r:.200}\n  got      {actual!r:.200}'
+    for kind, want, got in (('token', expected[0], actual[0]), ('error', expected[1], actual[1])):
+        for i in range(max(len(want), len(got))):
+            left = want[i] if i < len(want) else None
+            right = got[i] if i < len(got) else None
+            if left != right:
+                return f'{kind} {i}: expected {left!r}\n  got      {right!r}'
+    return 'no difference'
+
+
+def run_fuzz(checks=None, input_classes=INPUT_CLASSES, count=1000, seed=0, max_size=200,
+             reference_revision=REFERENCE_ORIGINAL, log=None):
+    """
+    Lexes `count` generated inputs of each class with every check: each backend against the reference
+    lexer, and streaming, relex of a random edit, columns and parallel chunks against scan_tokens.
+    Tokens, values, positions, error classes, messages and rendered errors must all match; the first
+    mismatch of each check and input class is shrunk to a minimal reproducer.
+
+    Returns:
+        dict: Per check and input class, the number of cases and mismatches, the seconds of the check and of
+            what it is compared with, the speedup, and the shrunk reproducers.
+    """
+    if checks is None:
+        checks = (*available_backends(), *PATH_CHECKS)
+    generator = InputGenerator(seed, max_size)
+    reference = ReferenceLexer(reference_revision)
+
+    results = []
+    try:
+        for input_class in input_classes:
+            inputs = [generator.generate(input_class) for _ in range(count)]
+            for check in checks:
+                checker = Checker(check, reference)
+                cases = check_cases(check, inputs, generator, random.Random(f'fuzz:{seed}:{input_class}:{check}'))
+                expected = checker.expected([text for text, parameter in cases])
+                result = {
+                    "check": check,
+                    "input_class": input_class,
+                    "cases": len(cases),
+                    "chars": sum(len(text) for text, parameter in cases),
+                    "mismatches": 0,
+                    "reference_seconds": 0.0,
+                    "seconds": 0.0,
+                    "reproducers": [],
+                }
+                for (text, parameter), (expected_outcome, reference_seconds) in zip(cases, expected):
+                    actual_outcome, seconds = checker.actual(text, parameter)
+                    result["reference_seconds"] += reference_seconds
+                    result["seconds"] += seconds
+                    if expected_outcome == actual_outcome:
+                        continue
+                    result["mismatches"] += 1
+                    if not result["reproducers"]:
+                        result["reproducers"].append(checker.reproducer(text, parameter))
+                result["speedup"] = result["reference_seconds"] / result["seconds"] if result["seconds"] else None
+                results.append(result)
+                if log:
+                    log(format_fuzz_result(result))
+    finally:
+        reference.close()
+
+    return {"reference": reference_revision, "seed": seed, "max_size": max_size, "results": results}
+
+
+def format_fuzz_result(result):
+    speedup = f"{result['speedup']:5.2f}x" if result['speedup'] is not None else '    -'
+    lines = [f"{result['check']:<8} {result['input_class']:<8} {result['cases']:>7,} cases "
+             f"{result['chars']:>10,} chars  {result['mismatches']:>5} mismatches  speedup {speedup}"]
+    for reproducer in result["reproducers"]:
+        for name, value in reproducer.items():
+            if name != "difference":
+                lines.append(f"  {name} {value!r}")
+        lines.append(f"  {reproducer['difference']}")
+    return '\n'.join(lines)
@@ -0,0 +1,61 @@
+import json
+import sys
+import time
+
+# Filename every fuzzed input is lexed under, so rendered errors compare equal
+FILENAME = '<fuzz>'
+
+
+def position(pos):
+    return None if pos is None else [pos.idx, pos.ln, pos.col]
+
+
+def outcome(tokens, errors):
+    """
+    Returns everything two lexers must agree on, as JSON-ready lists: each token's type, value, value type,
+    start position and end offset, and each error's class, message, positions and rendered text.
+    Only uses what Token and Error have always offered, so it also runs against older revisions of the lexer.
+    The line and column of a token's end are left out: the original lexer advanced the column past a newline
+    instead of starting the next line, and nothing reads them.
+    """
+    return [
+        [[token.type, token.value, type(token.value).__name__, position(token.pos_start), token.pos_end.idx]
+         for token in tokens],
+        [[type(error).__name__, error.error_name, error.details, position(error.pos_start), position(error.pos_end),
+          error.as_string()] for error in errors or []],
+    ]
+
+
+def timed_outcome(scan):
+    """
+    Runs a scan, a function returning tokens and errors.
+
+    Returns:
+        list: The outcome of the scan, or the exception it raised.
+        float: The seconds the scan took.
+    """
+    start = time.perf_counter()
+    try:
+        tokens, errors = scan()
+    except Exception as exc:
+        return ['exception', type(exc).__name__, str(exc)], time.perf_counter() - start
+    seconds = time.perf_counter() - start
+    return outcome(tokens, errors), seconds
+
+
+def main():
+    """
+    Serves the lexer of the source tree named on the command line: reads one JSON list of texts per line
+    and answers each with a JSON list of [outcome, seconds], one per text.
+    """
+    sys.path.insert(0, sys.argv[1])
+    from Lexer.lexer import Lexer
+
+    for line in sys.stdin:
+        results = [timed_outcome(lambda: Lexer(FILENAME, text).scan_tokens()) for text in json.loads(line)]
+        sys.stdout.write(json.dumps(results) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
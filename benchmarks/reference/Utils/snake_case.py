@@ -0,0 +1,3 @@
+import re
+
+SNAKE_CASE = re.compile(r'^[a-z_][a-z0-9_]*$')
\ No newline at end of file
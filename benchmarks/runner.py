@@ -0,0 +1,89 @@
+import gc
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from Lexer.lexer import Lexer, available_backends
+from Lexer.fingerprint import lexer_fingerprint
+from .corpus import PROFILES, generate_source
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def time_scan(text, backend, repeat):
+    """
+    Returns the best wall-clock time of `repeat` scans, with the token and error counts of the last one.
+    An untimed scan runs first to warm up caches.
+    """
+    Lexer('<bench>', text, backend=backend).scan_tokens()
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        tokens, errors = Lexer('<bench>', text, backend=backend).scan_tokens()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(tokens), len(errors or [])
+
+
+def peak_memory(text, backend):
+    """
+    Returns the peak traced allocation of one scan, in bytes. Measured separately because tracing slows scanning down.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        Lexer('<bench>', text, backend=backend).scan_tokens()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(profiles=tuple(PROFILES), sizes=DEFAULT_SIZES, backends=available_backends(), repeat=5, seed=0, measure_memory=True, log=None):
+    """
+    Times every backend on generated input for each profile and size.
+
+    Returns:
+        dict: Environment metadata and one result per (profile, size, backend).
+    """
+    results = []
+    for profile in profiles:
+        for size in sizes:
+            text = generate_source(size, profile, seed)
+            for backend in backends:
+                seconds, tokens, errors = time_scan(text, backend, repeat)
+                result = {
+                    "profile": profile,
+                    "size": size,
+                    "backend": backend,
+                    "chars": len(text),
+                    "tokens": tokens,
+                    "errors": errors,
+                    "seconds": seconds,
+                    "chars_per_sec": len(text) / seconds,
+                    "tokens_per_sec": tokens / seconds,
+                    "peak_bytes": peak_memory(text, backend) if measure_memory else None,
+                }
+                results.append(result)
+                if log:
+                    log(format_result(result))
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "lexer_fingerprint": lexer_fingerprint(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def format_result(result):
+    peak = f"{result['peak_bytes'] / 2**20:8.1f} MB" if result['peak_bytes'] is not None else '        -'
+    return (f"{result['profile']:<12} {result['size']:>10,} {result['backend']:<6} "
+            f"{result['chars_per_sec'] / 1e6:7.2f} Mchar/s {result['tokens_per_sec'] / 1e3:9.1f} ktok/s {peak}")
@@ -0,0 +1,74 @@
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must start fast, with their import-time budgets in milliseconds
+STARTUP_BUDGETS = {
+    'Lexer.lexer': 40, # the lexer core
+    'Lexer.batch': 50, # the command line, also imported by its worker processes
+}
+
+# Dependencies the lexer core and the command line must not import at startup
+HEAVY_MODULES = ('streamlit', 'pandas', 'numpy', 'pyarrow', 'sqlite3', 'asyncio', 'concurrent.futures', 'multiprocessing')
+
+# One line of -X importtime output: self and cumulative microseconds, then the indented module name
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def heavy_module(name):
+    """
+    Returns the heavy dependency the module belongs to, or None.
+    """
+    for heavy in HEAVY_MODULES:
+        if name == heavy or name.startswith(heavy + '.'):
+            return heavy
+    return None
+
+
+def measure_import(module, repeat=5):
+    """
+    Imports the module in fresh interpreters with -X importtime. The first run is not timed,
+    since it may still have to write bytecode caches.
+
+    Returns:
+        float: The best cumulative import time of the module, in milliseconds.
+        list: The heavy modules that were imported along with it.
+    """
+    best = None
+    heavy = set()
+    for run in range(repeat + 1):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                 cwd=ROOT, capture_output=True, text=True, check=True)
+        for line in process.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match is None:
+                continue
+            name = match.group(4)
+            if heavy_module(name) is not None:
+                heavy.add(heavy_module(name))
+            if name == module and not match.group(3) and run:
+                cumulative = int(match.group(2)) / 1000
+                best = cumulative if best is None else min(best, cumulative)
+    return best, sorted(heavy)
+
+
+def check_startup(budgets=STARTUP_BUDGETS, repeat=5, log=print):
+    """
+    Measures the import time of each module against its budget, and checks that none pulls in a heavy dependency.
+
+    Returns:
+        bool: True if every module is within its budget and imports no heavy dependency.
+    """
+    ok = True
+    for module, budget in budgets.items():
+        milliseconds, heavy = measure_import(module, repeat)
+        within = milliseconds <= budget and not heavy
+        ok = ok and within
+        status = 'ok' if within else 'FAIL'
+        log(f'{module:<16} {milliseconds:7.1f} ms  budget {budget} ms  {status}')
+        if heavy:
+            log(f'  imports heavy dependencies: {", ".join(heavy)}')
+    return ok
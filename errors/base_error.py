@@ -1,14 +1,33 @@
 from Utils.arrows import *
+from Lexer.position import Position
 
 # Base Error
 class Error:
-    def __init__(self, pos_start, pos_end, error_name, details):
-        self.pos_start = pos_start
-        self.pos_end = pos_end
+    '''Stores the error name and details, and the offsets of the lexeme in error. Rendering is deferred to as_string.'''
+    def __init__(self, start, end, line_index, error_name, details):
+        self.start = start
+        self.end = end
+        self.line_index = line_index
         self.error_name = error_name
         self.details = details
+
+    # Positions are only built when asked for
+    @property
+    def pos_start(self):
+        return Position(self.start, self.line_index)
+
+    @property
+    def pos_end(self):
+        return Position(self.end, self.line_index)
+
+    def lexeme(self):
+        return self.line_index.slice(self.start, self.end)
+
+    def group_key(self):
+        '''Errors with the same key are reported together.'''
+        return self.error_name, self.details
     
     def as_string(self):
         result = f'{self.error_name}: {self.details}'
-        result += '\n\n' + arrows(self.pos_start.ftext, self.pos_start, self.pos_end)
-        return result
\ No newline at end of file
+        result += '\n\n' + arrows(self.line_index, self.start, self.end)
+        return result
@@ -1,28 +1,35 @@
 from .base_error import Error
 
 class IllegalCharError(Error):
-    def __init__(self, pos_start, pos_end, details):
-        super().__init__(pos_start, pos_end, 'Illegal Character', details)
+    def __init__(self, start, end, line_index, details):
+        super().__init__(start, end, line_index, 'Illegal Character', details)
+
+    def group_key(self):
+        # The message names the position, so these are grouped by the character instead
+        return self.error_name, f"Illegal character '{self.lexeme()}'"
 
 class IllegalIdentifierError(Error):
-    def __init__(self, pos_start, pos_end, details):
-        super().__init__(pos_start, pos_end, 'Illegal Identifier', details)
+    def __init__(self, start, end, line_index, details):
+        super().__init__(start, end, line_index, 'Illegal Identifier', details)
 
 class IllegalNumberError(Error):
-    def __init__(self, pos_start, pos_end, details):
-        super().__init__(pos_start, pos_end, 'Illegal Number', details)
+    def __init__(self, start, end, line_index, details):
+        super().__init__(start, end, line_index, 'Illegal Number', details)
 
 class InvalidDecimalError(Error):
-    def __init__(self, pos_start, pos_end, details):
-        super().__init__(pos_start, pos_end, 'Invalid Decimal', details)
+    def __init__(self, start, end, line_index, details):
+        super().__init__(start, end, line_index, 'Invalid Decimal', details)
 
 class InvalidRelationalSymbol(Error):
-    def __init__(self, pos_start, pos_end, details):
-        super().__init__(pos_start, pos_end, 'Invalid Symbol', details)
+    def __init__(self, start, end, line_index, details):
+        super().__init__(start, end, line_index, 'Invalid Symbol', details)
         
 class LexicalError(Error):
-    def __init__(self, pos_start, pos_end, details):
-        super().__init__(pos_start, pos_end, 'Lexical Error', details)
+    def __init__(self, start, end, line_index, details):
+        super().__init__(start, end, line_index, 'Lexical Error', details)
 
-        
-        
\ No newline at end of file
+class TruncatedInputError(Error):
+    '''Marks where a scan stopped because a resource limit was reached. The reason names the limit.'''
+    def __init__(self, start, end, line_index, details, reason):
+        super().__init__(start, end, line_index, 'Input Truncated', details)
+        self.reason = reason
@@ -0,0 +1,71 @@
+import copy
+
+DEFAULT_PAGE_SIZE = 50
+
+
+class ErrorGroup:
+    '''Errors that share a kind and message.'''
+    def __init__(self, error_name, message):
+        self.error_name = error_name
+        self.message = message
+        self.errors = []
+
+    def __len__(self):
+        return len(self.errors)
+
+    def summary(self):
+        ln, col = self.errors[0].line_index.line_col(self.errors[0].start)
+        count = f' (x{len(self.errors)})' if len(self.errors) > 1 else ''
+        return f'{self.error_name}: {self.message}{count}, first at line {ln + 1}, column {col + 1}'
+
+
+class ErrorReport:
+    '''
+    Groups the errors of a lexer run and renders them lazily, one page at a time.
+    Grouping only reads the error kinds and messages; source lines and arrows are
+    rendered for the errors on the requested page only, from the file's shared line index.
+
+    A report that outlives its lexer run (for example in a cache, while the run's line index
+    is reset by incremental re-lexing) can be given a line index of its own.
+    '''
+    def __init__(self, errors, line_index=None):
+        self.errors = [error for error in errors or [] if error]
+
+        if line_index is not None:
+            self.errors = [copy.copy(error) for error in self.errors]
+            for error in self.errors:
+                error.line_index = line_index
+        self.groups = {} # (error name, message) -> ErrorGroup, in order of first occurrence
+
+        for error in self.errors:
+            key = error.group_key()
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = ErrorGroup(*key)
+            group.errors.append(error)
+
+    def __len__(self):
+        return len(self.errors)
+
+    def page_count(self, page_size=DEFAULT_PAGE_SIZE):
+        return max(1, -(-len(self.errors) // page_size))
+
+    def page(self, page, page_size=DEFAULT_PAGE_SIZE):
+        '''Returns the errors on a zero-based page.'''
+        return self.errors[page * page_size:(page + 1) * page_size]
+
+    def render_page(self, page, page_size=DEFAULT_PAGE_SIZE):
+        '''Renders the errors on a zero-based page with their source lines.'''
+        return '\n\n'.join(error.as_string() for error in self.page(page, page_size))
+
+    def summary(self, limit=None):
+        '''Returns one line per group of identical errors, largest first.'''
+        groups = sorted(self.groups.values(), key=len, reverse=True)
+        lines = [group.summary() for group in groups[:limit]]
+        if limit is not None and len(groups) > limit:
+            lines.append(f'... and {len(groups) - limit} more kinds of errors')
+        return '\n'.join(lines)
+
+    def as_string(self):
+        '''Renders every error. Prefer render_page for large reports.'''
+        return "No errors found." if not self.errors else '\n'.join(error.as_string() for error in self.errors)
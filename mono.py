@@ -1,7 +1,28 @@
+import os
 import streamlit as st
 from Lexer.tokens import *
-import pandas as pd
 from Lexer.lexer import Lexer
+from Lexer.columnar import TokenColumns, LINE_COLUMN, LEXEME_COLUMN, TOKEN_COLUMN
+from Lexer.incremental import diff_edit
+from Lexer.fingerprint import lexer_fingerprint
+from Lexer.line_index import LineIndex
+from Lexer.limits import LexerLimits, LIMIT_MAX_SECONDS
+from errors.lexer_errors import TruncatedInputError
+from errors.report import ErrorReport
+from Utils.token_cache import TokenCache
+
+# Memory limit of the token cache shared by all sessions
+TOKEN_CACHE_MAX_BYTES = int(os.environ.get("MONO_TOKEN_CACHE_MB", "256")) * 1024 * 1024
+
+# Rows of the token table sent to the browser at a time
+TOKEN_PAGE_SIZES = (50, 100, 500, 1000)
+
+# Limits of one lexer run, so a single bad input cannot hold up the server
+LEXER_LIMITS = LexerLimits(
+    max_errors=int(os.environ.get("MONO_LEXER_MAX_ERRORS", "1000")),
+    max_seconds=float(os.environ.get("MONO_LEXER_MAX_SECONDS", "5")),
+    max_input_size=int(os.environ.get("MONO_LEXER_MAX_INPUT_KB", "2048")) * 1024,
+)
 
 st.set_page_config(layout="wide", page_title="Mono Lexer", page_icon="📄")
 
@@ -9,38 +30,93 @@ def initialize_session_state():
     """Initialize session state variables."""
     st.session_state.setdefault("file_content", "")
     st.session_state.setdefault("lexer_output", "")
-    st.session_state.setdefault("errors", [])
+    st.session_state.setdefault("errors", None)
 
 initialize_session_state()
 
-def format_errors(errors):
-    """Format errors into a readable string."""
-    return "No errors found." if not errors else "\n".join(err.as_string() for err in errors if err)
-
 def run_lexer(filename, text):
-    """Run the lexer to generate tokens and errors."""
-    lexer = Lexer(filename, text)
-    return lexer.scan_tokens()
+    """
+    Run the lexer to generate tokens and errors, re-lexing only the edited part of the previous run.
+    Also returns the limit that truncated the run, or None.
+    """
+    previous = st.session_state.get("lexer_result")
+
+    # Only a complete run can be updated; the update is limited, and falls back to a limited full run
+    if previous and previous["filename"] == filename and not previous["truncated"]:
+        lexer = Lexer(filename, previous["text"], limits=LEXER_LIMITS)
+        tokens, errors = lexer.relex(previous["tokens"], previous["errors"], *diff_edit(previous["text"], text))
+    else:
+        lexer = Lexer(filename, text, limits=LEXER_LIMITS)
+        tokens, errors = lexer.scan_tokens()
+    truncated = lexer.truncated
+
+    st.session_state["lexer_result"] = {"filename": filename, "text": text, "tokens": tokens, "errors": errors,
+                                        "truncated": truncated}
+    return tokens, errors, truncated
+
+@st.cache_resource
+def get_token_cache():
+    """Token cache shared by every session of this server process."""
+    return TokenCache(TOKEN_CACHE_MAX_BYTES, lexer_fingerprint())
+
+def build_results(filename, content, tokens, errors):
+    """Build the token table, the token counts per type and the error report of a lexer run."""
+    # Built column-wise, with the token types as a categorical column
+    token_table = TokenColumns.from_tokens(tokens, content).to_dataframe(lines=True)
+    type_counts = token_table[TOKEN_COLUMN].value_counts()
+    type_counts = type_counts[type_counts > 0].rename_axis(TOKEN_COLUMN).reset_index(name="Count")
+    # The report gets its own line index, since incremental runs update the run's index in place
+    return token_table, type_counts, ErrorReport(errors, LineIndex(filename, content))
+
+def lexical_analysis(filename, content, profile=False):
+    """Perform lexical analysis and return results, reusing cached results for content seen before."""
+    if profile:
+        # Profiling needs a real run, so the cache and incremental lexing are bypassed
+        lexer = Lexer(filename, content, profile=True, limits=LEXER_LIMITS)
+        tokens, errors = lexer.scan_tokens()
+        st.session_state["lexer_stats"] = lexer.stats.as_dict()
+        return build_results(filename, content, tokens, errors)
+
+    cache = get_token_cache()
+    key = cache.key(content)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    tokens, errors, truncated = run_lexer(filename, content)
+    results = build_results(filename, content, tokens, errors)
+    if truncated == LIMIT_MAX_SECONDS:
+        # Depends on the server's load, so the next run may get further
+        return results
 
-def lexical_analysis(filename, content):
-    """Perform lexical analysis and return results."""
-    tokens, errors = run_lexer(filename, content)
+    # The report keeps the content for rendering, and each error a few hundred bytes
+    token_table, type_counts, error_report = results
+    size = int(token_table.memory_usage(deep=True).sum()) + len(content) + 200 * len(error_report)
+    cache.put(key, results, size)
+    return results
 
-    token_data = [
-        {"Lexeme": tok.value, "Token": tok.type} for tok in tokens
-        if isinstance(tok, Token)
-    ]
+def show_lexer_stats(stats):
+    """Show the profiling counters of the last profiled run in the sidebar."""
+    import pandas as pd
 
-    error_output = format_errors(errors)
-    return token_data, error_output
+    with st.sidebar:
+        st.subheader("Lexer Profile")
+        st.write(f"{stats['chars']:,} characters in {stats['seconds'] * 1000:.1f} ms ({stats['backend']} backend)")
+        st.write("Time per stage:")
+        st.dataframe(pd.DataFrame(stats["stages"]), use_container_width=True, hide_index=True)
+        st.write("Tokens and errors per kind:")
+        st.dataframe(pd.DataFrame(stats["kinds"]), use_container_width=True, hide_index=True)
 
 @st.dialog("📂 Open File", width="small")
 def open_file_dialog():
     """Modal dialog for Open File functionality."""
     uploaded_file = st.file_uploader("Upload a .mono file", type=["mono"], label_visibility="collapsed")
     
-    if uploaded_file:
-        st.session_state["file_content"] = uploaded_file.read().decode("utf-8")
+    if uploaded_file and uploaded_file.size > LEXER_LIMITS.max_input_size:
+        st.error(f"File is too large: {uploaded_file.size:,} bytes, the limit is {LEXER_LIMITS.max_input_size:,}.")
+    elif uploaded_file:
+        # Decoded straight from the upload's buffer, without another bytes copy; the editor needs a str
+        st.session_state["file_content"] = str(uploaded_file.getbuffer(), "utf-8")
         st.success(f"File uploaded successfully: {uploaded_file.name}")
         
         st.rerun() 
@@ -73,11 +149,61 @@ def save_file_dialog():
         st.success(f"File saved as {st.session_state['file_saved']}")
         del st.session_state["file_saved"] 
 
+def truncation(report):
+    """The error marking a truncated run, or None."""
+    if report and isinstance(report.errors[-1], TruncatedInputError):
+        return report.errors[-1]
+    return None
+
+def show_error_page(report, key):
+    """Show the error summary and one page of rendered errors."""
+    st.text(report.summary(limit=10))
+    page_count = report.page_count()
+    page = 1
+    if page_count > 1:
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, key=key)
+    st.code(report.render_page(page - 1), language=None)
+
+def show_token_table(token_table, type_counts):
+    """Show one page of the token table, filtered by token type and line range."""
+    st.write("Lexical Analysis Output:")
+    st.caption(f"{len(token_table):,} tokens of {len(type_counts)} types")
+    with st.expander("Tokens per type"):
+        st.dataframe(type_counts, use_container_width=True, hide_index=True)
+
+    types = st.multiselect("Token types", type_counts[TOKEN_COLUMN].tolist(), placeholder="All token types")
+    last_line = int(token_table[LINE_COLUMN].iloc[-1])
+    line_from, line_to = 1, last_line
+    if last_line > 1:
+        line_from, line_to = st.slider("Lines", 1, last_line, (1, last_line))
+
+    rows = token_table
+    if types:
+        rows = rows[rows[TOKEN_COLUMN].isin(types)]
+    if (line_from, line_to) != (1, last_line):
+        rows = rows[rows[LINE_COLUMN].between(line_from, line_to)]
+
+    page_size = st.selectbox("Rows per page", TOKEN_PAGE_SIZES)
+    page_count = max(1, -(-len(rows) // page_size))
+    page = 1
+    if page_count > 1:
+        # A new key for every filter, so the page starts over when the filters change
+        key = f"token_page_{hash((tuple(types), line_from, line_to, page_size))}"
+        page = st.number_input(f"Page (of {page_count:,})", min_value=1, max_value=page_count, value=1, key=key)
+
+    # Only the visible rows are serialized to the browser
+    first = (page - 1) * page_size
+    st.dataframe(rows.iloc[first:first + page_size][[LINE_COLUMN, LEXEME_COLUMN, TOKEN_COLUMN]],
+                 use_container_width=True, hide_index=True)
+    st.caption(f"Rows {min(first + 1, len(rows)):,}-{min(first + page_size, len(rows)):,} of {len(rows):,}")
+
 @st.dialog("⚠️ Error Details", width="small")
 def error_details_dialog():
     """Modal dialog for displaying error details."""
-    st.write(st.session_state["errors"])
+    show_error_page(st.session_state["errors"], key="error_dialog_page")
     
+profile_lexer = st.sidebar.toggle("Profile lexer", help="Record per-stage timings and counters on the next run")
+
 col1, col2= st.columns([6, 2])
 with col1:
     col3, col4, col5= st.columns([5, 3, 5])
@@ -109,21 +235,36 @@ with col2:
         if st.button("Run Lexer", use_container_width=True, type="primary", help="Run the lexer on the code"):
             content = st.session_state["file_content"].strip()
             if content:
-                token_data, error_output = lexical_analysis("unnamed", content)
+                st.session_state["analysis"] = lexical_analysis("unnamed", content, profile=profile_lexer)
+                error_report = st.session_state["analysis"][2]
                 
                 # if no errors, dont show dialog
-                if error_output != "No errors found.": 
-                    st.session_state["errors"] = error_output
+                if error_report:
+                    st.session_state["errors"] = error_report
                     error_details_dialog()
-                    
-                    with st.container(border=True):
-                        st.write("⚠️ Error Details:")
-                        st.write(st.session_state["errors"])
-
-                if token_data:
-                    st.write("Lexical Analysis Output:")
-                    st.dataframe(pd.DataFrame(token_data), use_container_width=True, hide_index=True)
             else:
+                st.session_state["analysis"] = None
                 st.warning("No content to analyze. Please write or upload a .mono file.")
 
+        # Results stay on screen while paging through them
+        if st.session_state.get("analysis"):
+            token_table, type_counts, error_report = st.session_state["analysis"]
+
+            truncated = truncation(error_report)
+            if truncated:
+                st.warning(f"Output is incomplete. {truncated.details}.")
+
+            if error_report:
+                with st.container(border=True):
+                    st.write(f"⚠️ Error Details ({len(error_report)} errors):")
+                    show_error_page(error_report, key="error_panel_page")
+
+            if not token_table.empty:
+                show_token_table(token_table, type_counts)
+
+            cache_stats = get_token_cache().stats()
+            st.caption(f"Token cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                       f"{cache_stats['entries']} entries ({cache_stats['bytes'] / 2**20:.1f} MB)")
 
+if profile_lexer and st.session_state.get("lexer_stats"):
+    show_lexer_stats(st.session_state["lexer_stats"])